@@ -36,7 +36,7 @@ from langchain.prompts import PromptTemplate
 from langchain.callbacks import get_openai_callback
 from process_runner import run_in_subprocess
 import model_worker
-from llm_models import get_model
+from llm_models import get_model, get_phase_model
 from utils import remove_thinking_tokens, create_backup_file, parse_backup_file, list_backup_files
 from email_sender import send_email_with_audio, send_email_with_attachments
 from telegram_sender import send_telegram_with_audio, send_telegram_with_attachments
@@ -302,8 +302,10 @@ def load_content():
             else:
                 print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Condensing content...")
                 condensed_content = condense_content(
-                    raw_content, current_model, checkpoint_key, checkpoint,
-                    script_style=script_style
+                    raw_content, get_phase_model(current_model_key, "reduce"),
+                    checkpoint_key, checkpoint,
+                    script_style=script_style,
+                    map_model=get_phase_model(current_model_key, "map"),
                 )
                 print(
                     f"[SUCCESS] Condensed: {len(raw_content)} -> {len(condensed_content)} chars"
@@ -1012,7 +1014,7 @@ def stream_chat():
 
             llm_start_time = time.time()
             total_chunk_size = 0
-            complete_response_text = ""
+            response_parts: list[str] = []  # joined once after streaming — avoids quadratic += copying
 
             print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Generating streaming LLM response for: '{user_input[:50]}...'")
 
@@ -1025,7 +1027,7 @@ def stream_chat():
 
                     if chunk_response:  # Only send non-empty chunks
                         chunk_received = True
-                        complete_response_text += chunk_response
+                        response_parts.append(chunk_response)
                         total_chunk_size += len(chunk_response)
                         # Send only the chunk during streaming
                         chunk_data = {'chunk': chunk_response}
@@ -1042,6 +1044,7 @@ def stream_chat():
                 }
 
             llm_time = time.time() - llm_start_time
+            complete_response_text = "".join(response_parts)
             print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Streaming complete. Time: {llm_time:.2f}s, Chunks: {total_chunk_size} chars")
 
             # Remove thinking tokens from complete response
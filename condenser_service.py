@@ -1,14 +1,37 @@
+import asyncio
+import functools
+import hashlib
+import os
+import threading
 from datetime import datetime
-from typing import Optional
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from typing import TYPE_CHECKING, Callable, Optional
 
 from system_prompts import *
-from utils import remove_thinking_tokens
+from utils import remove_thinking_tokens, DEBUG_LOGGING
 from condensation_cache import save_checkpoint, MAX_RETRIES_PER_STEP
+from llm_cache import (
+    get_condensed,
+    put_condensed,
+    get_map_result,
+    put_map_result,
+    is_cacheable,
+    model_identity,
+)
+
+# LangChain is imported on first use (see _get_splitter / _prompt_template),
+# so importing this module stays cheap until a condensation actually runs.
+if TYPE_CHECKING:
+    from langchain_core.prompts import ChatPromptTemplate
 
 # Configuration
 REDUCE_BATCH_SIZE = 3  # Number of chunks to reduce per batch (smaller = less hallucination)
 FINAL_CONSOLIDATION_THRESHOLD = 150000  # Chars threshold to trigger final consolidation
+MAP_MAX_PARALLEL = int(os.getenv("MAP_MAX_PARALLEL", "4"))  # MAP requests in flight at once (keeps LM Studio / Groq rate limits safe)
+MAP_CHUNK_SIZE = 10000  # Chars per MAP chunk
+MAP_CHUNK_OVERLAP = 200  # Chars shared between consecutive MAP chunks
+# Joins MAP outputs into one REDUCE input. str.join sizes the result in one
+# pass and copies each part once, so no StringIO / incremental building.
+MAP_RESULT_SEPARATOR = "\n\n---\n\n"
 
 
 def condense_content(
@@ -17,6 +40,7 @@ def condense_content(
     checkpoint_key: Optional[str] = None,
     checkpoint: Optional[dict] = None,
     script_style: str = "summary",
+    map_model=None,
 ) -> str:
     """Run map-reduce condensation, resuming from checkpoint if provided.
 
@@ -27,11 +51,15 @@ def condense_content(
         checkpoint:     Mutable checkpoint dict; updated in-place and saved after
                         every step so a crash loses at most one step's work.
         script_style:   'summary' (default) or 'analysis'.
+        map_model:      Optional LLM instance for the MAP phase only (e.g. a
+                        variant with a smaller output cap). Defaults to
+                        ``current_model``.
 
     Returns:
         Condensed text string.
     """
     _has_checkpoint = checkpoint_key is not None and checkpoint is not None
+    map_model = map_model if map_model is not None else current_model
 
     def _save() -> None:
         if _has_checkpoint:
@@ -39,6 +67,29 @@ def condense_content(
 
     print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] condense_content: Starting condensation for {len(content)} chars")
 
+    _prompts = analysis_map_reduce_prompts if script_style == "analysis" else map_reduce_custom_prompts
+
+    # ------------------------------------------------------------------
+    # Response cache — identical (model, prompts, content) skips all LLM work
+    # ------------------------------------------------------------------
+    _cacheable = is_cacheable(current_model)
+    _cache_model = model_identity(current_model)
+    _cache_context = f"{script_style}:{_prompts_fingerprint(_prompts)}"
+    if map_model is not current_model:
+        # Every MAP output the REDUCE step consumes comes from map_model
+        _cache_context += f":map={model_identity(map_model)}"
+    if _cacheable:
+        cached_output = get_condensed(content, _cache_model, _cache_context)
+        if cached_output is not None:
+            if _has_checkpoint:
+                checkpoint["final_output"] = cached_output
+                _save()
+            print(f"[SUCCESS] Condensation served from response cache: {len(cached_output)} chars")
+            return cached_output
+    else:
+        if DEBUG_LOGGING:
+            print(f"[DEBUG] Response cache skipped: {_cache_model} temperature is unset or above the cacheable limit")
+
     # ------------------------------------------------------------------
     # Stage 1 — split into chunks (idempotent; reuse stored split on resume)
     # ------------------------------------------------------------------
@@ -52,89 +103,54 @@ def condense_content(
             _save()
         print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Content split into {len(chunks)} chunks")
 
-    _prompts = analysis_map_reduce_prompts if script_style == "analysis" else map_reduce_custom_prompts
     map_prompt = _prompts["map_prompt"]
     reduce_prompt = _prompts["reduce_prompt"]
     reduce_with_context_prompt = _prompts["reduce_with_context_prompt"]
+    reduce_chain = _prompt_template(reduce_prompt) | current_model
+    reduce_with_context_chain = _prompt_template(reduce_with_context_prompt) | current_model
 
     # ------------------------------------------------------------------
-    # Stage 2 — MAP phase
+    # Stage 2 — MAP phase (overlapped with REDUCE in batch mode)
     # ------------------------------------------------------------------
-    print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Starting MAP phase ({len(chunks)} chunks)")
-    processed_chunks: list[str] = []
-
-    for idx, chunk in enumerate(chunks):
-        str_idx = str(idx)
-
-        # Resume: skip already-completed chunks
-        if _has_checkpoint and str_idx in checkpoint["map_results"]:
-            cached = checkpoint["map_results"][str_idx]
-            processed_chunks.append(cached)
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Resuming: MAP chunk {idx + 1}/{len(chunks)} already complete, skipping")
-            continue
-
-        # Retry cap: fail fast if this chunk has already blown its budget
-        if _has_checkpoint:
-            retries_used = checkpoint["map_retry_counts"].get(str_idx, 0)
-            if retries_used >= MAX_RETRIES_PER_STEP:
-                error_msg = (
-                    f"MAP chunk {idx + 1}/{len(chunks)} exceeded max retries "
-                    f"({MAX_RETRIES_PER_STEP}). Aborting — fix the model response or "
-                    f"delete the checkpoint to start fresh."
-                )
-                print(f"[ERROR] {error_msg}")
-                raise ValueError(error_msg)
-
-        print(f"[DEBUG] Processing MAP chunk {idx + 1}/{len(chunks)} ({len(chunk)} chars)")
-        map_input = f"""
-            System:
-            {yt_transcript_shortener_system_message}
-            Input:
-            {map_prompt.replace('{chunk_text}', chunk)}
-        """
-
-        try:
-            response = current_model.invoke(map_input)
-            chunk_response_text = response.content
-        except Exception as e:
-            print(f"[ERROR] Model crashed during MAP chunk {idx + 1}/{len(chunks)}: {e}")
-            if _has_checkpoint:
-                checkpoint["map_retry_counts"][str_idx] = (
-                    checkpoint["map_retry_counts"].get(str_idx, 0) + 1
-                )
-                _save()
-            raise ValueError(f"Model crashed during MAP chunk {idx + 1}/{len(chunks)}: {e}")
-
-        print(f"[DEBUG] MAP chunk {idx + 1} complete: {len(chunk_response_text)} chars")
-        cleaned, success = remove_thinking_tokens(chunk_response_text)
-
-        if not success:
-            error_msg = f"Failed to remove thinking tokens from MAP chunk {idx + 1}/{len(chunks)}"
-            print(f"[ERROR] {error_msg}")
-            # Persist retry count before raising so the caller can resume
-            if _has_checkpoint:
-                checkpoint["map_retry_counts"][str_idx] = (
-                    checkpoint["map_retry_counts"].get(str_idx, 0) + 1
-                )
-                _save()
-            raise ValueError(error_msg)
-
-        # Success — persist before moving on
-        if _has_checkpoint:
-            checkpoint["map_results"][str_idx] = cleaned
-            _save()
-
-        processed_chunks.append(cleaned)
-        print(f"[DEBUG] MAP chunk {idx + 1} processed: {len(cleaned)} chars")
+    # With more than one REDUCE batch, batch k needs only its own MAP chunks
+    # plus batch k-1's output, so it starts as soon as those are in instead
+    # of waiting for the slowest MAP chunk of the whole transcript.
+    pipelined = len(chunks) > REDUCE_BATCH_SIZE
+    print(
+        f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Starting MAP phase "
+        f"({len(chunks)} chunks, up to {MAP_MAX_PARALLEL} in parallel)"
+    )
+    if pipelined:
+        processed_chunks, batch_results = _run_async(
+            _run_pipelined_map_reduce(
+                chunks,
+                map_model,
+                map_prompt,
+                reduce_chain,
+                reduce_with_context_chain,
+                checkpoint if _has_checkpoint else None,
+                _save,
+            )
+        )
+    else:
+        processed_chunks = _run_async(
+            _run_map_phase(
+                chunks,
+                map_model,
+                map_prompt,
+                checkpoint if _has_checkpoint else None,
+                _save,
+            )
+        )
 
     print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] MAP phase complete. {len(processed_chunks)} chunks processed")
 
     # ------------------------------------------------------------------
     # Stage 3 — REDUCE phase
     # ------------------------------------------------------------------
-    print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Starting REDUCE phase")
+    if not pipelined:
+        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Starting REDUCE phase")
 
-    if len(processed_chunks) <= REDUCE_BATCH_SIZE:
         # ---- Single-batch reduce ----
         print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Single batch mode ({len(processed_chunks)} chunks)")
 
@@ -159,17 +175,13 @@ def condense_content(
                             f"Single-batch REDUCE exceeded max retries ({MAX_RETRIES_PER_STEP})."
                         )
 
-                combined_chunks = "\n\n---\n\n".join(processed_chunks)
-                reduce_input = f"""
-                    System:
-                    {yt_transcript_shortener_system_message}
-                    Input:
-                    {reduce_prompt.replace('{combined_map_results}', combined_chunks)}
-                """
+                combined_chunks = MAP_RESULT_SEPARATOR.join(processed_chunks)
+                reduce_input = {"combined_map_results": combined_chunks}
 
-                print(f"[DEBUG] Running REDUCE phase...")
+                if DEBUG_LOGGING:
+                    print(f"[DEBUG] Running REDUCE phase...")
                 try:
-                    response = current_model.invoke(reduce_input)
+                    response = reduce_chain.invoke(reduce_input)
                     reduce_response_text = response.content
                 except Exception as e:
                     print(f"[ERROR] Model crashed during single-batch REDUCE: {e}")
@@ -180,7 +192,8 @@ def condense_content(
                         _save()
                     raise ValueError(f"Model crashed during single-batch REDUCE: {e}")
 
-                print(f"[DEBUG] REDUCE complete: {len(reduce_response_text)} chars")
+                if DEBUG_LOGGING:
+                    print(f"[DEBUG] REDUCE complete: {len(reduce_response_text)} chars")
                 cleaned_reduce, success = remove_thinking_tokens(reduce_response_text)
                 if not success:
                     error_msg = "Failed to remove thinking tokens from single-batch REDUCE phase"
@@ -208,128 +221,7 @@ def condense_content(
             final_output = cleaned_reduce
 
     else:
-        # ---- Multi-batch reduce ----
-        num_batches = (len(processed_chunks) + REDUCE_BATCH_SIZE - 1) // REDUCE_BATCH_SIZE
-        print(
-            f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Batch mode: {len(processed_chunks)} chunks "
-            f"→ {num_batches} batches (with context continuity)"
-        )
-
-        if _has_checkpoint and checkpoint.get("reduce_batches_total") is None:
-            checkpoint["reduce_batches_total"] = num_batches
-            _save()
-
-        # Seed previous_context from the last already-completed batch so that
-        # a resumed run doesn't start batch N with empty context.
-        completed_batch_indices = sorted(
-            int(k) for k in checkpoint["reduce_results"]
-        ) if _has_checkpoint else []
-        previous_context = (
-            checkpoint["reduce_results"][str(completed_batch_indices[-1])]
-            if completed_batch_indices else ""
-        )
-
-        batch_results: list[str] = []
-
-        for batch_idx in range(num_batches):
-            str_batch = str(batch_idx)
-
-            # Case 1: Full resume — both reduce and TTS already done for this batch
-            if _has_checkpoint and str_batch in checkpoint.get("tts_results", {}):
-                tts_cached = checkpoint["tts_results"][str_batch]
-                batch_results.append(tts_cached)
-                # previous_context uses reduce result for LLM continuity (factual/dense)
-                previous_context = checkpoint.get("reduce_results", {}).get(str_batch, tts_cached)
-                print(
-                    f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] "
-                    f"Resuming: REDUCE+TTS batch {batch_idx + 1}/{num_batches} already complete, skipping"
-                )
-                continue
-
-            # Case 2: Partial resume — reduce done but TTS crashed for this batch
-            reduce_results_mb = checkpoint.get("reduce_results", {}) if _has_checkpoint else {}
-            if _has_checkpoint and str_batch in reduce_results_mb:
-                cleaned_batch = reduce_results_mb[str_batch]
-                print(
-                    f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] "
-                    f"Resuming: REDUCE batch {batch_idx + 1}/{num_batches} done, running TTS pass only"
-                )
-            else:
-                # Case 3: Fresh run — execute reduce
-                if _has_checkpoint:
-                    retries_used = checkpoint["reduce_retry_counts"].get(str_batch, 0)
-                    if retries_used >= MAX_RETRIES_PER_STEP:
-                        raise ValueError(
-                            f"REDUCE batch {batch_idx + 1}/{num_batches} exceeded max retries "
-                            f"({MAX_RETRIES_PER_STEP})."
-                        )
-
-                start_idx = batch_idx * REDUCE_BATCH_SIZE
-                end_idx = min((batch_idx + 1) * REDUCE_BATCH_SIZE, len(processed_chunks))
-                batch_chunks = processed_chunks[start_idx:end_idx]
-
-                print(
-                    f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] "
-                    f"Processing REDUCE batch {batch_idx + 1}/{num_batches} ({len(batch_chunks)} chunks)..."
-                )
-
-                combined_batch = "\n\n---\n\n".join(batch_chunks)
-
-                if batch_idx == 0:
-                    prompt_to_use = reduce_prompt.replace('{combined_map_results}', combined_batch)
-                else:
-                    context_snippet = previous_context[-3000:] if len(previous_context) > 3000 else previous_context
-                    prompt_to_use = reduce_with_context_prompt.replace('{previous_context}', context_snippet)
-                    prompt_to_use = prompt_to_use.replace('{combined_map_results}', combined_batch)
-
-                reduce_input = f"""
-                    System:
-                    {yt_transcript_shortener_system_message}
-                    Input:
-                    {prompt_to_use}
-                """
-
-                print(f"[DEBUG] Running REDUCE batch {batch_idx + 1}...")
-                try:
-                    response = current_model.invoke(reduce_input)
-                    batch_response_text = response.content
-                except Exception as e:
-                    print(f"[ERROR] Model crashed during REDUCE batch {batch_idx + 1}/{num_batches}: {e}")
-                    if _has_checkpoint:
-                        checkpoint["reduce_retry_counts"][str_batch] = (
-                            checkpoint["reduce_retry_counts"].get(str_batch, 0) + 1
-                        )
-                        _save()
-                    raise ValueError(f"Model crashed during REDUCE batch {batch_idx + 1}/{num_batches}: {e}")
-
-                print(f"[DEBUG] REDUCE batch {batch_idx + 1} complete: {len(batch_response_text)} chars")
-                cleaned_batch, success = remove_thinking_tokens(batch_response_text)
-                if not success:
-                    error_msg = f"Failed to remove thinking tokens from REDUCE batch {batch_idx + 1}/{num_batches}"
-                    print(f"[ERROR] {error_msg}")
-                    if _has_checkpoint:
-                        checkpoint["reduce_retry_counts"][str_batch] = (
-                            checkpoint["reduce_retry_counts"].get(str_batch, 0) + 1
-                        )
-                        _save()
-                    raise ValueError(error_msg)
-
-                if _has_checkpoint:
-                    checkpoint.setdefault("reduce_results", {})[str_batch] = cleaned_batch
-                    _save()
-
-            # TTS polish pass — TEMPORARILY DISABLED for output length testing
-            # tts_batch = _run_tts_pass(
-            #     cleaned_batch, current_model, str_batch, checkpoint, checkpoint_key, _prompts
-            # )
-            # if _has_checkpoint:
-            #     checkpoint.setdefault("tts_results", {})[str_batch] = tts_batch
-            #     _save()
-
-            batch_results.append(cleaned_batch)
-            previous_context = cleaned_batch  # use dense reduce result for LLM context continuity
-            print(f"[SUCCESS] REDUCE batch {batch_idx + 1} complete: {len(cleaned_batch)} chars")
-
+        # ---- Multi-batch reduce ---- (batches already reduced alongside MAP)
         final_output = "\n\n".join(batch_results)
         print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] All REDUCE batches combined: {len(final_output)} chars")
 
@@ -352,16 +244,12 @@ def condense_content(
                             f"Final consolidation exceeded max retries ({MAX_RETRIES_PER_STEP})."
                         )
 
-                consolidation_input = f"""
-                    System:
-                    {yt_transcript_shortener_system_message}
-                    Input:
-                    {reduce_prompt.replace('{combined_map_results}', final_output)}
-                """
+                consolidation_input = {"combined_map_results": final_output}
 
-                print(f"[DEBUG] Running final consolidation...")
+                if DEBUG_LOGGING:
+                    print(f"[DEBUG] Running final consolidation...")
                 try:
-                    response = current_model.invoke(consolidation_input)
+                    response = reduce_chain.invoke(consolidation_input)
                     consolidation_text = response.content
                 except Exception as e:
                     print(f"[ERROR] Model crashed during final consolidation: {e}")
@@ -403,11 +291,410 @@ def condense_content(
         checkpoint["final_output"] = final_output
         _save()
 
+    if _cacheable:
+        put_condensed(content, _cache_model, final_output, _cache_context)
+
     print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] REDUCE phase complete: {len(final_output)} chars")
     print(f"[SUCCESS] Condensation complete. Original: {len(content)} -> Final: {len(final_output)} chars")
     return final_output
 
 
+def _prompts_fingerprint(prompts_dict: dict) -> str:
+    """Short hash of the system prompt + prompt templates in use.
+
+    Part of the response-cache context so editing a prompt never replays
+    output produced by the old wording.
+    """
+    raw = "\0".join([yt_transcript_shortener_system_message, *(prompts_dict[k] for k in sorted(prompts_dict))])
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def _prompt_template(user_prompt: str) -> "ChatPromptTemplate":
+    """Build (once per template) a [system, human] ChatPromptTemplate for a condenser prompt.
+
+    Sending the shared system prompt as its own role message keeps a
+    byte-identical prefix across every MAP/REDUCE call, so LM Studio / vLLM
+    can reuse the prefix KV cache instead of re-prefilling it per request.
+    The variable text already sits at the end of each prompt template (only
+    the short output-protocol trailer follows it), so the template prefix is
+    reused too. Placeholders such as ``{chunk_text}`` are filled by LangChain
+    when the chain is invoked.
+    """
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate.from_messages([
+        ("system", yt_transcript_shortener_system_message),
+        ("human", user_prompt),
+    ])
+
+
+# One event loop for every condense_content() call, running in a daemon thread.
+# get_model() hands out the same model instance each time, and langchain_openai
+# keeps its httpx AsyncClient on it: pooled connections belong to the loop
+# that opened them, so a fresh asyncio.run() loop per call would inherit
+# connections from an already-closed one.
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+_async_loop_lock = threading.Lock()
+
+
+def _run_async(coro):
+    """Run ``coro`` on the shared background loop and block until it returns."""
+    global _async_loop
+    with _async_loop_lock:
+        if _async_loop is None:
+            _async_loop = asyncio.new_event_loop()
+            threading.Thread(target=_async_loop.run_forever, name="condenser-async", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _async_loop).result()
+
+
+async def _run_pipelined_map_reduce(
+    chunks: list[str],
+    current_model,
+    map_prompt: str,
+    reduce_chain,
+    reduce_with_context_chain,
+    checkpoint: Optional[dict],
+    save: Callable[[], None],
+) -> tuple[list[str], list[str]]:
+    """Run the MAP phase and the batched REDUCE phase concurrently.
+
+    REDUCE batches are still strictly sequential (each one is prompted with
+    the previous batch's output), but batch k no longer waits for the whole
+    MAP phase — only for its own REDUCE_BATCH_SIZE chunks.  While a straggling
+    MAP chunk for a later batch is still in flight, the earlier batches are
+    already being reduced.
+
+    Returns:
+        (cleaned MAP outputs in chunk order, REDUCE batch outputs in batch order)
+
+    Raises:
+        ValueError: From the MAP phase (REDUCE is then cancelled, since the
+                    batch waiting on the failed chunk can never start) or
+                    from a REDUCE batch (raised once MAP has finished, so
+                    every MAP result is checkpointed for the resumed run).
+    """
+    results: list[Optional[str]] = [None] * len(chunks)
+    chunk_ready = [asyncio.Event() for _ in chunks]
+
+    def _on_map_result(idx: int, text: str) -> None:
+        results[idx] = text
+        chunk_ready[idx].set()
+
+    reduce_task = asyncio.create_task(
+        _run_batched_reduce(
+            results, chunk_ready, reduce_chain, reduce_with_context_chain, checkpoint, save
+        )
+    )
+    try:
+        processed_chunks = await _run_map_phase(
+            chunks, current_model, map_prompt, checkpoint, save, _on_map_result
+        )
+    except BaseException:
+        reduce_task.cancel()
+        await asyncio.gather(reduce_task, return_exceptions=True)
+        raise
+
+    batch_results = await reduce_task
+    return processed_chunks, batch_results
+
+
+async def _run_batched_reduce(
+    results: list[Optional[str]],
+    chunk_ready: list[asyncio.Event],
+    reduce_chain,
+    reduce_with_context_chain,
+    checkpoint: Optional[dict],
+    save: Callable[[], None],
+) -> list[str]:
+    """Reduce MAP outputs in sequential batches with context continuity.
+
+    Each batch waits on ``chunk_ready`` for its own chunks, then reduces them
+    with the previous batch's output as context.  Finished batches are
+    checkpointed in ``reduce_results`` and skipped on resume.
+
+    Args:
+        results:     MAP outputs by chunk index, filled in as MAP completes.
+        chunk_ready: One event per chunk, set once ``results[idx]`` is final.
+        reduce_chain:              Prompt|model chain for the first batch.
+        reduce_with_context_chain: Prompt|model chain for later batches.
+        checkpoint:  Mutable checkpoint dict, or None for no persistence.
+        save:        Callback that persists ``checkpoint`` atomically.
+
+    Returns:
+        Cleaned REDUCE output per batch, in batch order.
+
+    Raises:
+        ValueError: On retry-cap breach, model crash or missing <final_script>
+                    tags (after persisting the retry count).
+    """
+    num_batches = (len(results) + REDUCE_BATCH_SIZE - 1) // REDUCE_BATCH_SIZE
+    print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Starting REDUCE phase")
+    print(
+        f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Batch mode: {len(results)} chunks "
+        f"→ {num_batches} batches (with context continuity)"
+    )
+
+    if checkpoint is not None and checkpoint.get("reduce_batches_total") is None:
+        checkpoint["reduce_batches_total"] = num_batches
+        save()
+
+    # Seed previous_context from the last already-completed batch so that
+    # a resumed run doesn't start batch N with empty context.
+    completed_batch_indices = sorted(
+        int(k) for k in checkpoint["reduce_results"]
+    ) if checkpoint is not None else []
+    previous_context = (
+        checkpoint["reduce_results"][str(completed_batch_indices[-1])]
+        if completed_batch_indices else ""
+    )
+
+    batch_results: list[str] = []
+
+    for batch_idx in range(num_batches):
+        str_batch = str(batch_idx)
+
+        # Case 1: Full resume — both reduce and TTS already done for this batch
+        if checkpoint is not None and str_batch in checkpoint.get("tts_results", {}):
+            tts_cached = checkpoint["tts_results"][str_batch]
+            batch_results.append(tts_cached)
+            # previous_context uses reduce result for LLM continuity (factual/dense)
+            previous_context = checkpoint.get("reduce_results", {}).get(str_batch, tts_cached)
+            print(
+                f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] "
+                f"Resuming: REDUCE+TTS batch {batch_idx + 1}/{num_batches} already complete, skipping"
+            )
+            continue
+
+        # Case 2: Partial resume — reduce done but TTS crashed for this batch
+        reduce_results_mb = checkpoint.get("reduce_results", {}) if checkpoint is not None else {}
+        if checkpoint is not None and str_batch in reduce_results_mb:
+            cleaned_batch = reduce_results_mb[str_batch]
+            print(
+                f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] "
+                f"Resuming: REDUCE batch {batch_idx + 1}/{num_batches} done, running TTS pass only"
+            )
+        else:
+            # Case 3: Fresh run — execute reduce
+            if checkpoint is not None:
+                retries_used = checkpoint["reduce_retry_counts"].get(str_batch, 0)
+                if retries_used >= MAX_RETRIES_PER_STEP:
+                    raise ValueError(
+                        f"REDUCE batch {batch_idx + 1}/{num_batches} exceeded max retries "
+                        f"({MAX_RETRIES_PER_STEP})."
+                    )
+
+            start_idx = batch_idx * REDUCE_BATCH_SIZE
+            end_idx = min((batch_idx + 1) * REDUCE_BATCH_SIZE, len(results))
+
+            # Wait only for this batch's own MAP chunks (usually already done)
+            for event in chunk_ready[start_idx:end_idx]:
+                await event.wait()
+            batch_chunks = results[start_idx:end_idx]
+
+            print(
+                f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] "
+                f"Processing REDUCE batch {batch_idx + 1}/{num_batches} ({len(batch_chunks)} chunks)..."
+            )
+
+            combined_batch = MAP_RESULT_SEPARATOR.join(batch_chunks)
+
+            if batch_idx == 0:
+                chain_to_use = reduce_chain
+                reduce_input = {"combined_map_results": combined_batch}
+            else:
+                context_snippet = previous_context[-3000:] if len(previous_context) > 3000 else previous_context
+                chain_to_use = reduce_with_context_chain
+                reduce_input = {"previous_context": context_snippet, "combined_map_results": combined_batch}
+
+            if DEBUG_LOGGING:
+                print(f"[DEBUG] Running REDUCE batch {batch_idx + 1}...")
+            try:
+                response = await chain_to_use.ainvoke(reduce_input)
+                batch_response_text = response.content
+            except Exception as e:
+                print(f"[ERROR] Model crashed during REDUCE batch {batch_idx + 1}/{num_batches}: {e}")
+                if checkpoint is not None:
+                    checkpoint["reduce_retry_counts"][str_batch] = (
+                        checkpoint["reduce_retry_counts"].get(str_batch, 0) + 1
+                    )
+                    save()
+                raise ValueError(f"Model crashed during REDUCE batch {batch_idx + 1}/{num_batches}: {e}")
+
+            if DEBUG_LOGGING:
+                print(f"[DEBUG] REDUCE batch {batch_idx + 1} complete: {len(batch_response_text)} chars")
+            cleaned_batch, success = remove_thinking_tokens(batch_response_text)
+            if not success:
+                error_msg = f"Failed to remove thinking tokens from REDUCE batch {batch_idx + 1}/{num_batches}"
+                print(f"[ERROR] {error_msg}")
+                if checkpoint is not None:
+                    checkpoint["reduce_retry_counts"][str_batch] = (
+                        checkpoint["reduce_retry_counts"].get(str_batch, 0) + 1
+                    )
+                    save()
+                raise ValueError(error_msg)
+
+            if checkpoint is not None:
+                checkpoint.setdefault("reduce_results", {})[str_batch] = cleaned_batch
+                save()
+
+        # TTS polish pass — TEMPORARILY DISABLED for output length testing
+        # tts_batch = _run_tts_pass(
+        #     cleaned_batch, current_model, str_batch, checkpoint, checkpoint_key, _prompts
+        # )
+        # if checkpoint is not None:
+        #     checkpoint.setdefault("tts_results", {})[str_batch] = tts_batch
+        #     save()
+
+        batch_results.append(cleaned_batch)
+        previous_context = cleaned_batch  # use dense reduce result for LLM context continuity
+        print(f"[SUCCESS] REDUCE batch {batch_idx + 1} complete: {len(cleaned_batch)} chars")
+
+    return batch_results
+
+
+async def _run_map_phase(
+    chunks: list[str],
+    current_model,
+    map_prompt: str,
+    checkpoint: Optional[dict],
+    save: Callable[[], None],
+    on_result: Optional[Callable[[int, str], None]] = None,
+) -> list[str]:
+    """Run the MAP step over all chunks concurrently, preserving chunk order.
+
+    MAP chunks have no cross-chunk dependency, so every pending chunk goes out
+    in a single ``abatch_as_completed`` call with at most MAP_MAX_PARALLEL
+    requests in flight.  Each chunk is checkpointed the moment its result
+    arrives, and a failing chunk does not cancel its siblings — their results
+    are persisted so a resumed run only redoes the failed chunks.
+
+    Args:
+        chunks:        Split content, in order.
+        current_model: LangChain LLM instance.
+        map_prompt:    MAP prompt template containing ``{chunk_text}``.
+        checkpoint:    Mutable checkpoint dict, or None for no persistence.
+        save:          Callback that persists ``checkpoint`` atomically.
+        on_result:     Optional callback ``(idx, cleaned)`` invoked as soon as a
+                       chunk's output is known (resumed, cached or freshly mapped).
+
+    Returns:
+        Cleaned MAP outputs, one per chunk, in the same order as ``chunks``.
+
+    Raises:
+        ValueError: On retry-cap breach, model crash or missing <final_script>
+                    tags (the first failing chunk, in chunk order, is raised).
+    """
+    total = len(chunks)
+    results: list[Optional[str]] = [None] * total
+    pending: list[int] = []
+    cacheable = is_cacheable(current_model)
+    model_name = model_identity(current_model)
+
+    def _done(idx: int, cleaned: str) -> None:
+        results[idx] = cleaned
+        if on_result is not None:
+            on_result(idx, cleaned)
+
+    for idx in range(total):
+        str_idx = str(idx)
+
+        # Resume: skip already-completed chunks
+        if checkpoint is not None and str_idx in checkpoint["map_results"]:
+            _done(idx, checkpoint["map_results"][str_idx])
+            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Resuming: MAP chunk {idx + 1}/{total} already complete, skipping")
+            continue
+
+        # Chunk cache: same chunk + prompts + model already mapped in an earlier run
+        if cacheable:
+            cached = get_map_result(chunks[idx], model_name, yt_transcript_shortener_system_message, map_prompt)
+            if cached is not None:
+                _done(idx, cached)
+                if checkpoint is not None:
+                    checkpoint["map_results"][str_idx] = cached
+                    save()
+                print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] MAP chunk {idx + 1}/{total} served from chunk cache")
+                continue
+
+        # Retry cap: fail fast if this chunk has already blown its budget
+        if checkpoint is not None:
+            retries_used = checkpoint["map_retry_counts"].get(str_idx, 0)
+            if retries_used >= MAX_RETRIES_PER_STEP:
+                error_msg = (
+                    f"MAP chunk {idx + 1}/{total} exceeded max retries "
+                    f"({MAX_RETRIES_PER_STEP}). Aborting — fix the model response or "
+                    f"delete the checkpoint to start fresh."
+                )
+                print(f"[ERROR] {error_msg}")
+                raise ValueError(error_msg)
+
+        pending.append(idx)
+
+    def _record_failure(str_idx: str) -> None:
+        # Persist retry count before raising so the caller can resume
+        if checkpoint is not None:
+            checkpoint["map_retry_counts"][str_idx] = (
+                checkpoint["map_retry_counts"].get(str_idx, 0) + 1
+            )
+            save()
+
+    map_chain = _prompt_template(map_prompt) | current_model
+    map_inputs = [{"chunk_text": chunks[idx]} for idx in pending]
+    if DEBUG_LOGGING:
+        for idx in pending:
+            print(f"[DEBUG] Queued MAP chunk {idx + 1}/{total} ({len(chunks[idx])} chars)")
+
+    # One batched call; LangChain runs the requests concurrently (capped by
+    # max_concurrency) and yields each result as soon as it arrives, so
+    # every chunk is still checkpointed individually.
+    first_error: Optional[tuple[int, ValueError]] = None
+    async for pos, response in map_chain.abatch_as_completed(
+        map_inputs,
+        config={"max_concurrency": MAP_MAX_PARALLEL},
+        return_exceptions=True,
+    ):
+        idx = pending[pos]
+        str_idx = str(idx)
+        try:
+            if isinstance(response, Exception):
+                print(f"[ERROR] Model crashed during MAP chunk {idx + 1}/{total}: {response}")
+                _record_failure(str_idx)
+                raise ValueError(f"Model crashed during MAP chunk {idx + 1}/{total}: {response}")
+
+            chunk_response_text = response.content
+            if DEBUG_LOGGING:
+                print(f"[DEBUG] MAP chunk {idx + 1} complete: {len(chunk_response_text)} chars")
+            cleaned, success = remove_thinking_tokens(chunk_response_text)
+
+            if not success:
+                error_msg = f"Failed to remove thinking tokens from MAP chunk {idx + 1}/{total}"
+                print(f"[ERROR] {error_msg}")
+                _record_failure(str_idx)
+                raise ValueError(error_msg)
+        except ValueError as e:
+            # Keep draining so sibling results are still checkpointed;
+            # report the earliest failing chunk once the batch finishes.
+            if first_error is None or idx < first_error[0]:
+                first_error = (idx, e)
+            continue
+
+        # Success — persist before moving on
+        if checkpoint is not None:
+            checkpoint["map_results"][str_idx] = cleaned
+            save()
+        if cacheable:
+            put_map_result(chunks[idx], model_name, yt_transcript_shortener_system_message, map_prompt, cleaned)
+
+        _done(idx, cleaned)
+        if DEBUG_LOGGING:
+            print(f"[DEBUG] MAP chunk {idx + 1} processed: {len(cleaned)} chars")
+
+    if first_error is not None:
+        raise first_error[1]
+
+    return results  # type: ignore[return-value]
+
+
 def _run_tts_pass(
     text: str,
     current_model,
@@ -453,17 +740,14 @@ def _run_tts_pass(
                 f"Aborting — fix the model response or delete the checkpoint to start fresh."
             )
 
-    tts_input = f"""
-        System:
-        {yt_transcript_shortener_system_message}
-        Input:
-        {_prompts["tts_prompt"].replace("{text_to_refine}", text)}
-    """
+    tts_chain = _prompt_template(_prompts["tts_prompt"]) | current_model
+    tts_input = {"text_to_refine": text}
 
-    print(f"[DEBUG] Running TTS pass for batch {retry_key} ({len(text)} chars)...")
+    if DEBUG_LOGGING:
+        print(f"[DEBUG] Running TTS pass for batch {retry_key} ({len(text)} chars)...")
 
     try:
-        response = current_model.invoke(tts_input)
+        response = tts_chain.invoke(tts_input)
         tts_response_text = response.content
     except Exception as e:
         print(f"[ERROR] Model crashed during TTS pass for batch {retry_key}: {e}")
@@ -473,7 +757,8 @@ def _run_tts_pass(
             _save()
         raise ValueError(f"Model crashed during TTS pass for batch {retry_key}: {e}")
 
-    print(f"[DEBUG] TTS pass for batch {retry_key} complete: {len(tts_response_text)} chars")
+    if DEBUG_LOGGING:
+        print(f"[DEBUG] TTS pass for batch {retry_key} complete: {len(tts_response_text)} chars")
     cleaned, success = remove_thinking_tokens(tts_response_text)
 
     if not success:
@@ -485,19 +770,33 @@ def _run_tts_pass(
             _save()
         raise ValueError(error_msg)
 
-    print(f"[DEBUG] TTS pass for batch {retry_key} cleaned: {len(cleaned)} chars")
+    if DEBUG_LOGGING:
+        print(f"[DEBUG] TTS pass for batch {retry_key} cleaned: {len(cleaned)} chars")
     return cleaned
 
 
-def split_content(content: str):
-    chunk_size = 10000
-    chunk_overlap = 200
-    print(f"[DEBUG] split_content: Splitting {len(content)} chars with chunk_size={chunk_size}, overlap={chunk_overlap}")
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap
+@functools.lru_cache(maxsize=None)
+def _get_splitter():
+    """Build the MAP splitter on first use; stateless, so one instance serves every call."""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    return RecursiveCharacterTextSplitter(
+        chunk_size=MAP_CHUNK_SIZE,
+        chunk_overlap=MAP_CHUNK_OVERLAP
     )
-    
-    chunks = splitter.split_text(content)
-    print(f"[DEBUG] split_content: Created {len(chunks)} chunks")
-    return chunks
\ No newline at end of file
+
+
+def split_content(content: str) -> list[str]:
+    """Split content into overlapping MAP chunks.
+
+    Deliberately eager rather than a generator feeding MAP as chunks appear:
+    the full split is stored in checkpoint["map_chunks"] before any LLM call
+    so a resumed run maps exactly the same chunks, and the splitter finishes
+    in milliseconds against MAP calls that take seconds each.
+    """
+    if DEBUG_LOGGING:
+        print(f"[DEBUG] split_content: Splitting {len(content)} chars with chunk_size={MAP_CHUNK_SIZE}, overlap={MAP_CHUNK_OVERLAP}")
+    chunks = _get_splitter().split_text(content)
+    if DEBUG_LOGGING:
+        print(f"[DEBUG] split_content: Created {len(chunks)} chunks")
+    return chunks
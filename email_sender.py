@@ -1,20 +1,435 @@
+import base64
+import io
+import re
 import smtplib
 import os
+import uuid
+from contextlib import ExitStack
 from datetime import datetime
+from email.generator import BytesGenerator
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from email.mime.audio import MIMEAudio
 from email.mime.base import MIMEBase
-from email import encoders
 from pathlib import Path
-from typing import Optional, List
+from typing import BinaryIO, Iterator, Optional, List, Union
+
+SMTP_HOST = 'smtp.gmail.com'
+SMTP_PORT = 465
+
+# Attachments are never loaded into memory: each MIME part carries this
+# placeholder as its payload, and at send time the placeholder is replaced by
+# the file's base64 encoding streamed straight onto the SMTP socket.
+_ATTACHMENT_PLACEHOLDER = f"@@attachment-{uuid.uuid4().hex}@@"
+# 57 raw bytes encode to exactly one 76-char base64 line, so reading in
+# multiples of 57 keeps every line full except the last (~8 KB per read).
+_BASE64_READ_SIZE = 57 * 144
+# Buffer size for DATA: headers, boundaries and base64 blocks are coalesced
+# into 64 KB sendall() calls instead of one syscall per write.
+_SEND_BUFFER_SIZE = 64 * 1024
+# send_batch() gives up once a third of a batch of at least this size has
+# failed — at that point the problem is systemic, not per-message.
+_BATCH_ABORT_MIN_SIZE = 30
+# SMTP transparency (RFC 5321 §4.5.2): a line starting with "." gets one more.
+_LEADING_DOT = re.compile(rb'(?m)^\.')
+
+
+class _DisconnectedAfterData(smtplib.SMTPServerDisconnected):
+    """The session dropped after the end-of-data marker was written.
+
+    The server may already have accepted the message, so it must not be
+    sent again.
+    """
+
+
+def _iter_base64(file: BinaryIO) -> Iterator[bytes]:
+    """Yield the base64 encoding of an open file as CRLF-separated 76-char lines."""
+    block = file.read(_BASE64_READ_SIZE)
+    while block:
+        next_block = file.read(_BASE64_READ_SIZE)
+        encoded = base64.encodebytes(block).replace(b'\n', b'\r\n')
+        # The generator already puts CRLF before the next boundary
+        yield encoded if next_block else encoded[:-2]
+        block = next_block
+
+
+def _as_recipient_list(recipient_email: Union[str, List[str]]) -> List[str]:
+    """Normalise a single address or a list of addresses to a list."""
+    if isinstance(recipient_email, str):
+        return [recipient_email] if recipient_email else []
+    return [address for address in recipient_email if address]
+
+
+def _attachment_part(file_name: str, maintype: str, subtype: str) -> MIMEBase:
+    """MIME part with final headers whose base64 body is filled in at send time."""
+    part = MIMEBase(maintype, subtype)
+    part['Content-Transfer-Encoding'] = 'base64'
+    part.add_header('Content-Disposition', f'attachment; filename="{file_name}"')
+    part.set_payload(_ATTACHMENT_PLACEHOLDER)
+    return part
+
+
+class GmailSender:
+    """
+    Gmail SMTP sender that keeps one authenticated SMTP_SSL session open.
+
+    The TLS handshake and AUTH happen lazily on the first send and are reused
+    for every message after that, so sending N emails costs one login instead
+    of N. Before each send the session is health-checked with NOOP and
+    transparently re-established if Gmail has dropped it.
+
+    Usage:
+        with GmailSender() as sender:
+            sender.send_audio(recipient, subject, body, "summary.wav")
+            sender.send_attachments(recipient, subject, body, ["a.wav", "b.txt"])
+
+    Environment Variables:
+        GMAIL_ADDRESS: Your Gmail email address
+        GMAIL_APP_PASSWORD: Your Gmail app password (not regular password)
+    """
+
+    def __init__(self, sender_email: Optional[str] = None, app_password: Optional[str] = None):
+        # Get credentials from env variables if not provided
+        self.sender_email = sender_email or os.getenv('GMAIL_ADDRESS')
+        self.app_password = app_password or os.getenv('GMAIL_APP_PASSWORD')
+        self._server: Optional[smtplib.SMTP_SSL] = None
+        self._auth_failed = False
+        # Last body part built — batches usually repeat the same body text, and
+        # a MIMEText part can safely be attached to any number of messages.
+        self._body_cache: Optional[tuple[str, MIMEText]] = None
+
+    def __enter__(self) -> "GmailSender":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.close()
+        return False
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> smtplib.SMTP_SSL:
+        # Connect to Gmail SMTP server using SSL (port 465)
+        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Connecting to Gmail SMTP server (SSL)...")
+        server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT)
+        try:
+            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Logging in as {self.sender_email}")
+            server.login(self.sender_email, self.app_password)
+        except smtplib.SMTPAuthenticationError:
+            self._auth_failed = True
+            server.close()
+            raise
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        return server
+
+    def _ensure_connected(self) -> smtplib.SMTP_SSL:
+        """Return a live session, reconnecting if the cached one no longer answers NOOP."""
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except (smtplib.SMTPServerDisconnected, OSError):
+                pass
+            print("[WARNING] SMTP session lost, reconnecting...")
+            self._discard()
+        return self._connect()
+
+    def _discard(self) -> None:
+        if self._server is not None:
+            try:
+                self._server.close()
+            except Exception:
+                pass
+            self._server = None
+
+    def close(self) -> None:
+        """QUIT the SMTP session if one is open."""
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _validate(self, recipients: List[str]) -> bool:
+        if not self.sender_email:
+            print("[ERROR] Sender email not provided. Set GMAIL_ADDRESS env variable or pass sender_email parameter")
+            return False
+
+        if not self.app_password:
+            print("[ERROR] App password not provided. Set GMAIL_APP_PASSWORD env variable or pass app_password parameter")
+            return False
+
+        if not recipients:
+            print("[ERROR] Recipient email is required")
+            return False
+
+        return True
+
+    def _body_part(self, body_text: str) -> MIMEText:
+        if self._body_cache is None or self._body_cache[0] != body_text:
+            self._body_cache = (body_text, MIMEText(body_text, 'plain'))
+        return self._body_cache[1]
+
+    def _new_message(self, recipients: List[str], subject: str, body_text: str) -> MIMEMultipart:
+        # Create message container
+        msg = MIMEMultipart()
+        msg['From'] = self.sender_email
+        msg['To'] = ", ".join(recipients)
+        msg['Subject'] = subject
+
+        # Attach text body
+        msg.attach(self._body_part(body_text))
+        return msg
+
+    def _send(self, msg: MIMEMultipart, recipients: List[str], attachments: List[Union[str, bytes]] = ()) -> None:
+        """Send ``msg``, streaming one file (path or in-memory bytes) per attachment placeholder, in order."""
+        with ExitStack() as stack:
+            # Open everything up front so a missing file fails before DATA starts
+            files = [
+                io.BytesIO(source) if isinstance(source, bytes) else stack.enter_context(open(source, 'rb'))
+                for source in attachments
+            ]
+            segments = self._flatten(msg)
+
+            server = self._ensure_connected()
+            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending email to {', '.join(recipients)}")
+            try:
+                self._transmit(server, segments, files, recipients)
+            except _DisconnectedAfterData:
+                # Possibly delivered already; a resend could duplicate it
+                self._discard()
+                raise
+            except smtplib.SMTPServerDisconnected:
+                # Dropped between NOOP and end of DATA — retry once on a fresh session
+                self._discard()
+                for file in files:
+                    file.seek(0)
+                self._transmit(self._connect(), segments, files, recipients)
+
+    @staticmethod
+    def _flatten(msg: MIMEMultipart) -> List[bytes]:
+        """Serialise ``msg`` with CRLF line endings, split around attachment placeholders."""
+        buffer = io.BytesIO()
+        BytesGenerator(buffer, policy=msg.policy.clone(linesep='\r\n')).flatten(msg)
+        return buffer.getvalue().split(_ATTACHMENT_PLACEHOLDER.encode())
+
+    def _transmit(self, server: smtplib.SMTP_SSL, segments: List[bytes], files: List[BinaryIO], recipients: List[str]) -> None:
+        """Run one MAIL/RCPT/DATA transaction, base64-encoding files onto the socket.
+
+        Every recipient gets its own RCPT TO in the same transaction, so the
+        message is built and uploaded once however many people receive it.
+        """
+        server.ehlo_or_helo_if_needed()
+
+        code, response = server.mail(self.sender_email)
+        if code != 250:
+            server.rset()
+            raise smtplib.SMTPSenderRefused(code, response, self.sender_email)
+
+        refused = {}
+        for recipient in recipients:
+            code, response = server.rcpt(recipient)
+            if code not in (250, 251):
+                refused[recipient] = (code, response)
+        if len(refused) == len(recipients):
+            server.rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+        for recipient, (code, response) in refused.items():
+            print(f"[WARNING] Recipient refused, skipping: {recipient} ({code} {response!r})")
+
+        code, response = server.docmd('data')
+        if code != 354:
+            server.rset()
+            raise smtplib.SMTPDataError(code, response)
+
+        data_sent = False
+        try:
+            with server.sock.makefile('wb', buffering=_SEND_BUFFER_SIZE) as out:
+                for index, segment in enumerate(segments):
+                    out.write(_LEADING_DOT.sub(b'..', segment))
+                    if index < len(files):
+                        # Base64 lines never start with "." so need no dot-stuffing
+                        for chunk in _iter_base64(files[index]):
+                            out.write(chunk)
+                out.write(b'.\r\n' if segments[-1].endswith(b'\r\n') else b'\r\n.\r\n')
+                # From here on (including the final flush) the server may have the whole message
+                data_sent = True
+        except OSError:
+            # Same contract as smtplib.SMTP.send(): a broken socket is a disconnect
+            server.close()
+            if data_sent:
+                raise _DisconnectedAfterData('Server disconnected after end of DATA')
+            raise smtplib.SMTPServerDisconnected('Server not connected')
+
+        try:
+            code, response = server.getreply()
+        except smtplib.SMTPServerDisconnected as e:
+            raise _DisconnectedAfterData(f'Server disconnected after end of DATA: {e}') from e
+        if code != 250:
+            raise smtplib.SMTPDataError(code, response)
+
+    @staticmethod
+    def _report_failure(error: Exception, file_path: Optional[str] = None) -> bool:
+        if isinstance(error, smtplib.SMTPAuthenticationError):
+            print("[ERROR] Authentication failed. Check your email and app password")
+            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Make sure you're using an App Password, not your regular Gmail password")
+            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Generate App Password at: https://myaccount.google.com/apppasswords")
+        elif isinstance(error, smtplib.SMTPException):
+            print(f"[ERROR] SMTP error occurred: {error}")
+        elif isinstance(error, FileNotFoundError) and file_path:
+            print(f"[ERROR] Audio file not found: {file_path}")
+        else:
+            print(f"[ERROR] Unexpected error: {error}")
+        return False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def send_audio(
+        self,
+        recipient_email: Union[str, List[str]],
+        subject: str,
+        body_text: str,
+        audio_file_path: Union[str, bytes],
+        audio_file_name: Optional[str] = None
+    ) -> bool:
+        """
+        Send an email with a WAV audio file attachment over the shared session.
+
+        ``recipient_email`` may be a list; all recipients share one SMTP
+        transaction. ``audio_file_path`` may also be the WAV data itself as
+        bytes, in which case ``audio_file_name`` names the attachment.
+
+        Returns:
+            True if email sent successfully, False otherwise
+        """
+        recipients = _as_recipient_list(recipient_email)
+        if not self._validate(recipients):
+            return False
+
+        # A missing file surfaces as FileNotFoundError when _send() opens it,
+        # before anything goes over the wire — no separate exists() check.
+        if isinstance(audio_file_path, bytes):
+            file_name = audio_file_name or "audio.wav"
+        else:
+            file_name = audio_file_name or Path(audio_file_path).name
+
+        if not file_name.lower().endswith('.wav'):
+            print(f"[WARNING] File extension is not .wav: {file_name}")
+
+        try:
+            msg = self._new_message(recipients, subject, body_text)
+
+            # Attach audio file (streamed from disk during send)
+            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Attaching audio file: {file_name}")
+            msg.attach(_attachment_part(file_name, 'audio', 'wav'))
+
+            self._send(msg, recipients, [audio_file_path])
+            print(f"[SUCCESS] Email sent successfully to {', '.join(recipients)}")
+            return True
+
+        except Exception as e:
+            return self._report_failure(e, file_name if isinstance(audio_file_path, bytes) else audio_file_path)
+
+    def send_attachments(
+        self,
+        recipient_email: Union[str, List[str]],
+        subject: str,
+        body_text: str,
+        attachment_paths: List[str] = None
+    ) -> bool:
+        """
+        Send an email with multiple file attachments over the shared session.
+
+        ``recipient_email`` may be a list; all recipients share one SMTP
+        transaction.
+
+        Returns:
+            True if email sent successfully, False otherwise
+        """
+        recipients = _as_recipient_list(recipient_email)
+        if not self._validate(recipients):
+            return False
+
+        try:
+            msg = self._new_message(recipients, subject, body_text)
+
+            # Attach files if provided (streamed from disk during send)
+            attached: List[str] = []
+            if attachment_paths:
+                for file_path in attachment_paths:
+                    try:
+                        os.stat(file_path)
+                    except OSError:
+                        print(f"[WARNING] Attachment not found, skipping: {file_path}")
+                        continue
+
+                    file_name = os.path.basename(file_path)
+                    print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Attaching file: {file_name}")
+
+                    # Determine attachment type based on extension
+                    if file_path.lower().endswith('.wav'):
+                        msg.attach(_attachment_part(file_name, 'audio', 'wav'))
+                    else:
+                        msg.attach(_attachment_part(file_name, 'application', 'octet-stream'))
+                    attached.append(file_path)
+
+            self._send(msg, recipients, attached)
+            print(f"[SUCCESS] Email sent successfully to {', '.join(recipients)}")
+            return True
+
+        except Exception as e:
+            return self._report_failure(e)
+
+    def send_batch(self, messages: List[dict]) -> List[bool]:
+        """
+        Send several emails over one SMTP session.
+
+        Each entry holds the keyword arguments of send_audio() (when it has an
+        ``audio_file_path`` key) or send_attachments(). A failed message is
+        logged and skipped; the rest of the batch still goes out. An
+        authentication failure stops the batch, since every later message
+        would fail the same way — as does a third of a batch of
+        _BATCH_ABORT_MIN_SIZE or more failing.
+
+        Returns:
+            One success flag per message, in input order
+        """
+        results: List[bool] = []
+        failures = 0
+        for message in messages:
+            if 'audio_file_path' in message:
+                ok = self.send_audio(**message)
+            else:
+                ok = self.send_attachments(**message)
+            results.append(ok)
+
+            if not ok and (self._auth_failed or not (self.sender_email and self.app_password)):
+                print(f"[ERROR] Aborting batch after {len(results)}/{len(messages)} messages: credentials rejected")
+                break
+
+            failures += not ok
+            if len(messages) >= _BATCH_ABORT_MIN_SIZE and failures * 3 >= len(messages):
+                print(f"[ERROR] Aborting batch after {failures} failures in {len(results)}/{len(messages)} messages")
+                break
+        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Batch complete: {sum(results)}/{len(messages)} sent")
+        return results
 
 
 def send_email_with_audio(
-    recipient_email: str,
+    recipient_email: Union[str, List[str]],
     subject: str,
     body_text: str,
-    audio_file_path: str,
+    audio_file_path: Union[str, bytes],
     sender_email: Optional[str] = None,
     app_password: Optional[str] = None
 ) -> bool:
@@ -22,10 +437,10 @@ def send_email_with_audio(
     Send an email with a WAV audio file attachment using Gmail SMTP.
     
     Args:
-        recipient_email: Recipient's email address
+        recipient_email: Recipient's email address, or a list of addresses
         subject: Email subject line
         body_text: Text content for email body
-        audio_file_path: Path to the WAV audio file to attach
+        audio_file_path: Path to the WAV audio file to attach, or its bytes
         sender_email: Sender's Gmail address (defaults to env var GMAIL_ADDRESS)
         app_password: Gmail app password (defaults to env var GMAIL_APP_PASSWORD)
         
@@ -36,85 +451,11 @@ def send_email_with_audio(
         GMAIL_ADDRESS: Your Gmail email address
         GMAIL_APP_PASSWORD: Your Gmail app password (not regular password)
     """
-    # Get credentials from env variables if not provided
-    sender_email = sender_email or os.getenv('GMAIL_ADDRESS')
-    app_password = app_password or os.getenv('GMAIL_APP_PASSWORD')
-    
-    # Validate inputs
-    if not sender_email:
-        print("[ERROR] Sender email not provided. Set GMAIL_ADDRESS env variable or pass sender_email parameter")
-        return False
-        
-    if not app_password:
-        print("[ERROR] App password not provided. Set GMAIL_APP_PASSWORD env variable or pass app_password parameter")
-        return False
-    
-    if not recipient_email:
-        print("[ERROR] Recipient email is required")
-        return False
-        
-    # Validate audio file exists
-    audio_path = Path(audio_file_path)
-    if not audio_path.exists():
-        print(f"[ERROR] Audio file not found: {audio_file_path}")
-        return False
-        
-    if not audio_path.suffix.lower() == '.wav':
-        print(f"[WARNING] File extension is not .wav: {audio_file_path}")
-    
-    try:
-        # Create message container
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = recipient_email
-        msg['Subject'] = subject
-        
-        # Attach text body
-        msg.attach(MIMEText(body_text, 'plain'))
-        
-        # Attach audio file
-        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Attaching audio file: {audio_path.name}")
-        with open(audio_file_path, 'rb') as audio_file:
-            audio_data = audio_file.read()
-            audio_attachment = MIMEAudio(audio_data, 'wav')
-            audio_attachment.add_header(
-                'Content-Disposition',
-                f'attachment; filename="{audio_path.name}"'
-            )
-            msg.attach(audio_attachment)
-        
-        # Connect to Gmail SMTP server using SSL (port 465)
-        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Connecting to Gmail SMTP server (SSL)...")
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Logging in as {sender_email}")
-            server.login(sender_email, app_password)
-            
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending email to {recipient_email}")
-            server.send_message(msg)
-            
-        print(f"[SUCCESS] Email sent successfully to {recipient_email}")
-        return True
-        
-    except smtplib.SMTPAuthenticationError:
-        print("[ERROR] Authentication failed. Check your email and app password")
-        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Make sure you're using an App Password, not your regular Gmail password")
-        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Generate App Password at: https://myaccount.google.com/apppasswords")
-        return False
-        
-    except smtplib.SMTPException as e:
-        print(f"[ERROR] SMTP error occurred: {e}")
-        return False
-        
-    except FileNotFoundError:
-        print(f"[ERROR] Audio file not found: {audio_file_path}")
-        return False
-        
-    except Exception as e:
-        print(f"[ERROR] Unexpected error: {e}")
-        return False
+    with GmailSender(sender_email, app_password) as sender:
+        return sender.send_audio(recipient_email, subject, body_text, audio_file_path)
 
 def send_email_with_attachments(
-    recipient_email: str,
+    recipient_email: Union[str, List[str]],
     subject: str,
     body_text: str,
     attachment_paths: List[str] = None,
@@ -125,7 +466,7 @@ def send_email_with_attachments(
     Send an email with multiple file attachments using Gmail SMTP.
     
     Args:
-        recipient_email: Recipient's email address
+        recipient_email: Recipient's email address, or a list of addresses
         subject: Email subject line
         body_text: Text content for email body
         attachment_paths: List of file paths to attach
@@ -135,85 +476,8 @@ def send_email_with_attachments(
     Returns:
         True if email sent successfully, False otherwise
     """
-    # Get credentials from env variables if not provided
-    sender_email = sender_email or os.getenv('GMAIL_ADDRESS')
-    app_password = app_password or os.getenv('GMAIL_APP_PASSWORD')
-    
-    # Validate inputs
-    if not sender_email:
-        print("[ERROR] Sender email not provided. Set GMAIL_ADDRESS env variable or pass sender_email parameter")
-        return False
-        
-    if not app_password:
-        print("[ERROR] App password not provided. Set GMAIL_APP_PASSWORD env variable or pass app_password parameter")
-        return False
-    
-    if not recipient_email:
-        print("[ERROR] Recipient email is required")
-        return False
-    
-    try:
-        # Create message container
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = recipient_email
-        msg['Subject'] = subject
-        
-        # Attach text body
-        msg.attach(MIMEText(body_text, 'plain'))
-        
-        # Attach files if provided
-        if attachment_paths:
-            for file_path in attachment_paths:
-                if not os.path.exists(file_path):
-                    print(f"[WARNING] Attachment not found, skipping: {file_path}")
-                    continue
-                
-                file_name = os.path.basename(file_path)
-                print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Attaching file: {file_name}")
-                
-                with open(file_path, 'rb') as f:
-                    file_data = f.read()
-                    
-                    # Determine attachment type based on extension
-                    if file_path.lower().endswith('.wav'):
-                        attachment = MIMEAudio(file_data, 'wav')
-                    else:
-                        attachment = MIMEBase('application', 'octet-stream')
-                        attachment.set_payload(file_data)
-                        encoders.encode_base64(attachment)
-                    
-                    attachment.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename="{file_name}"'
-                    )
-                    msg.attach(attachment)
-        
-        # Connect to Gmail SMTP server using SSL (port 465)
-        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Connecting to Gmail SMTP server (SSL)...")
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Logging in as {sender_email}")
-            server.login(sender_email, app_password)
-            
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending email to {recipient_email}")
-            server.send_message(msg)
-            
-        print(f"[SUCCESS] Email sent successfully to {recipient_email}")
-        return True
-        
-    except smtplib.SMTPAuthenticationError:
-        print("[ERROR] Authentication failed. Check your email and app password")
-        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Make sure you're using an App Password, not your regular Gmail password")
-        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Generate App Password at: https://myaccount.google.com/apppasswords")
-        return False
-        
-    except smtplib.SMTPException as e:
-        print(f"[ERROR] SMTP error occurred: {e}")
-        return False
-        
-    except Exception as e:
-        print(f"[ERROR] Unexpected error: {e}")
-        return False
+    with GmailSender(sender_email, app_password) as sender:
+        return sender.send_attachments(recipient_email, subject, body_text, attachment_paths)
 
 # if __name__ == "__main__":
 #     # Example usage
@@ -0,0 +1,220 @@
+"""
+Content-addressed response cache for condense_content().
+
+Unlike condensation_cache (per-URL resume checkpoints with a 24h TTL), this
+cache is keyed on the *content* itself, so re-condensing the same transcript
+— a re-uploaded video, a retried news URL, iteration during testing — is
+served without a single LLM call.
+
+Two tiers for the final output:
+  exact    — SHA-256(model_name \\0 context \\0 content) → final output.
+  semantic — optional (LLM_CACHE_SEMANTIC=1): cosine similarity between
+             embeddings of SEMANTIC_WINDOWS slices spread over the whole content
+             catches near-duplicate transcripts (edited captions, re-uploads),
+             without matching two videos that merely share an intro or sponsor
+             read.  A hit also needs the lengths to agree within
+             SEMANTIC_MIN_LENGTH_RATIO.  Embeddings are computed in a spawn
+             subprocess via model_worker.embed_worker so the Flask process never
+             loads model weights.
+
+Individual MAP results are cached too, keyed on
+SHA-256(model_name \\0 system_prompt \\0 map_prompt \\0 chunk): a re-run after
+tweaking only the REDUCE prompt, or a transcript whose chunks are unchanged
+except for its tail, skips the MAP calls for every chunk it has seen before.
+
+Entries live in a diskcache.Cache under llm_cache/ (persistent, process-safe).
+
+Only near-deterministic models are cached: a model whose temperature is above
+LLM_CACHE_MAX_TEMPERATURE (or unset) would legitimately produce a different
+script on every run, so replaying one sample would silently freeze it.
+"""
+
+import hashlib
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+CACHE_DIR = Path("llm_cache")
+CACHEABLE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.3"))
+SEMANTIC_CACHE_ENABLED = os.getenv("LLM_CACHE_SEMANTIC", "0") == "1"
+SEMANTIC_SIMILARITY_THRESHOLD = 0.95
+SEMANTIC_WINDOWS = 8          # slices embedded per content (evenly spaced)
+SEMANTIC_WINDOW_CHARS = 1000  # ~256 tokens, the embedding model's input limit
+SEMANTIC_MIN_LENGTH_RATIO = 0.9
+
+_cache = None                          # lazily opened diskcache.Cache
+_semantic_available = SEMANTIC_CACHE_ENABLED
+_pending_embeddings: dict[str, list[float]] = {}  # exact key → embedding computed on a miss
+# A miss whose condensation fails (or is never stored) leaves its vector
+# behind; only the most recent few are kept for put_condensed to reuse.
+_PENDING_EMBEDDINGS_MAX = 16
+
+
+def _get_cache():
+    """Open the on-disk cache on first use (keeps import of this module cheap)."""
+    global _cache
+    if _cache is None:
+        from diskcache import Cache
+        _cache = Cache(str(CACHE_DIR))
+    return _cache
+
+
+# ---------------------------------------------------------------------------
+# Model identity / determinism gate
+# ---------------------------------------------------------------------------
+
+def model_identity(model) -> str:
+    """Return a stable name for a LangChain chat model instance."""
+    return (
+        getattr(model, "model_name", None)
+        or getattr(model, "model", None)
+        or type(model).__name__
+    )
+
+
+def is_cacheable(model) -> bool:
+    """True if the model is deterministic enough for its output to be replayed."""
+    temperature = getattr(model, "temperature", None)
+    return temperature is not None and temperature <= CACHEABLE_MAX_TEMPERATURE
+
+
+def response_key(model_name: str, content: str, context: str = "") -> str:
+    """SHA-256 key for (model, context, content).
+
+    ``context`` carries everything else that changes the output for the same
+    content — e.g. script style and a fingerprint of the prompt templates.
+    """
+    raw = f"{model_name}\0{context}\0{content}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Semantic tier
+# ---------------------------------------------------------------------------
+
+def _sample_windows(text: str) -> list[str]:
+    """Up to SEMANTIC_WINDOWS slices of SEMANTIC_WINDOW_CHARS covering the whole text."""
+    if len(text) <= SEMANTIC_WINDOWS * SEMANTIC_WINDOW_CHARS:
+        return [text[i:i + SEMANTIC_WINDOW_CHARS] for i in range(0, len(text), SEMANTIC_WINDOW_CHARS)] or [text]
+    step = (len(text) - SEMANTIC_WINDOW_CHARS) / (SEMANTIC_WINDOWS - 1)
+    return [text[round(i * step):round(i * step) + SEMANTIC_WINDOW_CHARS] for i in range(SEMANTIC_WINDOWS)]
+
+
+def _embed(text: str) -> Optional[list[float]]:
+    """Embed text in a spawn subprocess; disables the semantic tier on failure."""
+    global _semantic_available
+    from process_runner import run_in_subprocess
+    import model_worker
+
+    try:
+        return run_in_subprocess(model_worker.embed_worker, _sample_windows(text))
+    except Exception as e:
+        print(f"[WARNING] llm_cache: semantic tier disabled — embedding failed: {e}")
+        print("[WARNING] llm_cache: install with: pip install sentence-transformers")
+        _semantic_available = False
+        return None
+
+
+def _semantic_index_key(model_name: str, context: str) -> str:
+    # v2: whole-text window embeddings + content length (v1 held prefix-only vectors)
+    return f"semantic_index:v2:{model_name}:{context}"
+
+
+def _semantic_lookup(key: str, content: str, model_name: str, context: str) -> Optional[str]:
+    import numpy as np
+
+    index = _get_cache().get(_semantic_index_key(model_name, context), [])
+    if not index:
+        return None
+
+    query = _embed(content)
+    if query is None:
+        return None
+    _pending_embeddings.pop(key, None)
+    _pending_embeddings[key] = query
+    while len(_pending_embeddings) > _PENDING_EMBEDDINGS_MAX:
+        del _pending_embeddings[next(iter(_pending_embeddings))]
+
+    vectors = np.asarray([vec for vec, _, _ in index], dtype=np.float32)
+    # Embeddings are unit-normalised, so the dot product is the cosine.
+    scores = vectors @ np.asarray(query, dtype=np.float32)
+    # A near-duplicate transcript is also close in length
+    lengths = np.asarray([length for _, _, length in index], dtype=np.float32)
+    ratio = np.minimum(lengths, len(content)) / np.maximum(np.maximum(lengths, len(content)), 1)
+    scores[ratio < SEMANTIC_MIN_LENGTH_RATIO] = -1.0
+    best = int(np.argmax(scores))
+    if scores[best] < SEMANTIC_SIMILARITY_THRESHOLD:
+        return None
+
+    hit = _get_cache().get(index[best][1])
+    if hit is not None:
+        print(
+            f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] llm_cache: semantic hit "
+            f"(cosine={scores[best]:.3f})"
+        )
+    return hit
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def get_condensed(content: str, model_name: str, context: str = "") -> Optional[str]:
+    """Return a cached condensation for ``content`` or None on a miss."""
+    key = response_key(model_name, content, context)
+    try:
+        hit = _get_cache().get(key)
+        if hit is not None:
+            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] llm_cache: exact hit ({len(hit)} chars)")
+            return hit
+        if _semantic_available:
+            return _semantic_lookup(key, content, model_name, context)
+    except Exception as e:
+        print(f"[WARNING] llm_cache: lookup failed, continuing without cache: {e}")
+    return None
+
+
+def put_condensed(content: str, model_name: str, result: str, context: str = "") -> None:
+    """Store a finished condensation (best-effort — failures are logged, not raised)."""
+    key = response_key(model_name, content, context)
+    try:
+        cache = _get_cache()
+        cache.set(key, result)
+
+        if _semantic_available:
+            embedding = _pending_embeddings.pop(key, None) or _embed(content)
+            if embedding is not None:
+                index_key = _semantic_index_key(model_name, context)
+                with cache.transact():
+                    index = cache.get(index_key, [])
+                    index.append((embedding, key, len(content)))
+                    cache.set(index_key, index)
+    except Exception as e:
+        print(f"[WARNING] llm_cache: failed to store result: {e}")
+
+
+def _map_key(chunk: str, model_name: str, system_prompt: str, map_prompt: str) -> str:
+    raw = f"map\0{model_name}\0{system_prompt}\0{map_prompt}\0{chunk}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get_map_result(chunk: str, model_name: str, system_prompt: str, map_prompt: str) -> Optional[str]:
+    """Return the cached cleaned MAP output for one chunk, or None on a miss."""
+    try:
+        return _get_cache().get(_map_key(chunk, model_name, system_prompt, map_prompt))
+    except Exception as e:
+        print(f"[WARNING] llm_cache: MAP lookup failed, continuing without cache: {e}")
+        return None
+
+
+def put_map_result(chunk: str, model_name: str, system_prompt: str, map_prompt: str, result: str) -> None:
+    """Store one cleaned MAP output (best-effort)."""
+    try:
+        _get_cache().set(_map_key(chunk, model_name, system_prompt, map_prompt), result)
+    except Exception as e:
+        print(f"[WARNING] llm_cache: failed to store MAP result: {e}")
@@ -1,5 +1,4 @@
-from langchain_groq import ChatGroq
-from langchain_openai import ChatOpenAI
+import functools
 import os
 from dotenv import load_dotenv
 
@@ -11,158 +10,223 @@ load_dotenv()
 
 LM_STUDIO_BASE_URL = os.getenv("LM_STUDIO_BASE_URL", "http://localhost:1234/v1")
 
+# Ask llama.cpp-based servers to reuse the KV cache for a matching prompt
+# prefix (the condenser's shared system prompt). Merged only into models that
+# already send sampler settings via extra_body; servers that don't know the
+# field ignore it.
+LM_STUDIO_EXTRA_BODY = {"cache_prompt": True}
+
 # ---------------------------------------------------------------------------
 # Model definitions
+#
+# Each model is a zero-arg factory rather than a module-level instance, so
+# importing this module builds no HTTP clients; get_model() constructs only
+# the model that is actually requested, once. The langchain_openai /
+# langchain_groq imports live inside the factories for the same reason —
+# only the provider actually used is ever imported.
 # ---------------------------------------------------------------------------
 
-groq_llm = ChatGroq(
-    model=os.getenv("GROQ_MODEL_ID", "openai/gpt-oss-20b"),
-    api_key=os.getenv("GROQ_API_KEY"),
-    temperature=0.3,
-    max_completion_tokens=65000,
-)
-
-gemma_local_llm = ChatOpenAI(
-    base_url=LM_STUDIO_BASE_URL,
-    api_key="test",
-    temperature=0.7,
-    model=os.getenv("GEMMA_MODEL_ID", "google/gemma-3-27b")
-)
-
-nemotron_local_llm = ChatOpenAI(
-    base_url=LM_STUDIO_BASE_URL,
-    api_key="test",
-    temperature=0.3,
-    model=os.getenv("NEMOTRON_MODEL_ID", "nvidia/nemotron-3-nano"),
-    top_p= 0.70,
-    max_completion_tokens= 10000,
-    model_kwargs= {
-        "frequency_penalty": 1.3, # Heavily discourages "The speaker says..." loops
-        "presence_penalty": 0.3,  # Encourages introducing new topics/facts
-    },
-    timeout= 3600
-)
-
-nemotron_stream_local_llm = ChatOpenAI(
-    base_url=LM_STUDIO_BASE_URL,
-    api_key="test",
-    temperature=0.7,
-    model=os.getenv("NEMOTRON_STREAM_MODEL_ID", "nvidia/nemotron-3-nano"),
-    top_p= 0.85,
-    max_completion_tokens= 15000,
-    model_kwargs= {
-        "frequency_penalty": 1, # Heavily discourages "The speaker says..." loops
-        "presence_penalty": 0.5,  # Encourages introducing new topics/facts
-    },
-    extra_body={
-        "min_p": 0.05,
-        "repeat_penalty": 1.1
-    },
-    # streaming=True,
-    # stream_usage=True,
-    timeout= 3600
-)
-
-nexveridian_qwen_stream_local_llm = ChatOpenAI(
-    base_url=LM_STUDIO_BASE_URL,
-    api_key="test",
-    temperature=0.7,
-    model=os.getenv("NEXVERIDIAN_QWEN_MODEL_ID", "nexveridian/qwen3.5-35b-a3b"),
-    top_p=0.85,
-    max_completion_tokens=20000,
-    model_kwargs={
-        "frequency_penalty": 0.8,
-        "presence_penalty": 0.6,
-    },
-    extra_body={
-        "min_p": 0.05,
-        "repeat_penalty": 1.15
-    },
-    # streaming=True,
-    # stream_usage=True,
-    timeout=3600
-)
-
-mlx_community_qwen_stream_local_llm = ChatOpenAI(
-    base_url=LM_STUDIO_BASE_URL,
-    api_key="test",
-    temperature=0.6,
-    model=os.getenv("MLX_QWEN_MODEL_ID", "mlx-community/qwen3.5-35b-a3b"),
-    top_p=0.9,
-    max_completion_tokens=15000,
-    model_kwargs={
-        "frequency_penalty": 0.3,
-        "presence_penalty": 0.2,
-    },
-    extra_body={
-        "min_p": 0,
-        "repeat_penalty": 1.15
-    },
-    # streaming=True,
-    # stream_usage=True,
-    timeout=3600
-)
-
-google_gemma_4_26b_a4b = ChatOpenAI(
-    base_url=LM_STUDIO_BASE_URL,
-    api_key="test",
-    temperature=0.6,
-    model=os.getenv("GEMMA_4_MODEL_ID", "google/gemma-4-26b-a4b"),
-    top_p=0.9,
-    max_completion_tokens=15000,
-    model_kwargs={
-        "frequency_penalty": 0.3,
-        "presence_penalty": 0.2,
-    },
-    extra_body={
-        "min_p": 0,
-        "repeat_penalty": 1.15
-    },
-    # streaming=True,
-    # stream_usage=True,
-    timeout=3600
-)
-
-deepseekR1_local_llm = ChatOpenAI(
-    base_url=LM_STUDIO_BASE_URL,
-    api_key="test",
-    temperature=0.7,
-    model=os.getenv("DEEPSEEK_MODEL_ID", "deepseek/deepseek-r1-0528-qwen3-8b")
-)
-
-gpt_oss_20b_local_llm = ChatOpenAI(
-    base_url=LM_STUDIO_BASE_URL,
-    api_key="lm-studio",
-    model=os.getenv("GPT_OSS_MODEL_ID", "openai/gpt-oss-20b"),
-    extra_body={"reasoning_effort": "high"},
-    max_completion_tokens=12800,
-    temperature=0.5,
-    # streaming=True,
-)
-
-mistral_local_llm = ChatOpenAI(
-    base_url=LM_STUDIO_BASE_URL,
-    api_key="test",
-    temperature=0.7,
-    model=os.getenv("MISTRAL_MODEL_ID", "mlx-community/Mistral-7B-Instruct-v0.3-4bit"),
-    top_p=0.85,
-    max_completion_tokens=15000,
-    model_kwargs={
-        "frequency_penalty": 1,
-        "presence_penalty": 0.5,
-    },
-    extra_body={
-        "min_p": 0.05,
-        "repeat_penalty": 1.1
-    },
-    # streaming=True,
-    # stream_usage=True,
-    timeout=3600
-)
+
+def _groq_chat(max_completion_tokens):
+    from langchain_groq import ChatGroq
+    return ChatGroq(
+        model=os.getenv("GROQ_MODEL_ID", "openai/gpt-oss-20b"),
+        api_key=os.getenv("GROQ_API_KEY"),
+        temperature=0.3,
+        max_completion_tokens=max_completion_tokens,
+    )
+
+
+def groq_llm():
+    return _groq_chat(65000)
+
+
+# Condenser-phase variants of groq_llm. Groq schedules by the declared output
+# budget, and condenser outputs are far below 65k: MAP chunks come back at
+# ~2-3k tokens and REDUCE batches at ~10k. The caps leave room for the
+# model's reasoning tokens, which count toward max_completion_tokens.
+def groq_llm_map():
+    return _groq_chat(8192)
+
+
+def groq_llm_reduce():
+    return _groq_chat(16000)
+
+
+def gemma_local_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        base_url=LM_STUDIO_BASE_URL,
+        api_key="test",
+        temperature=0.7,
+        model=os.getenv("GEMMA_MODEL_ID", "google/gemma-3-27b")
+    )
+
+
+def nemotron_local_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        base_url=LM_STUDIO_BASE_URL,
+        api_key="test",
+        temperature=0.3,
+        model=os.getenv("NEMOTRON_MODEL_ID", "nvidia/nemotron-3-nano"),
+        top_p= 0.70,
+        max_completion_tokens= 10000,
+        model_kwargs= {
+            "frequency_penalty": 1.3, # Heavily discourages "The speaker says..." loops
+            "presence_penalty": 0.3,  # Encourages introducing new topics/facts
+        },
+        timeout= 3600
+    )
+
+
+def nemotron_stream_local_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        base_url=LM_STUDIO_BASE_URL,
+        api_key="test",
+        temperature=0.7,
+        model=os.getenv("NEMOTRON_STREAM_MODEL_ID", "nvidia/nemotron-3-nano"),
+        top_p= 0.85,
+        max_completion_tokens= 15000,
+        model_kwargs= {
+            "frequency_penalty": 1, # Heavily discourages "The speaker says..." loops
+            "presence_penalty": 0.5,  # Encourages introducing new topics/facts
+        },
+        extra_body={
+            **LM_STUDIO_EXTRA_BODY,
+            "min_p": 0.05,
+            "repeat_penalty": 1.1
+        },
+        # streaming=True,
+        # stream_usage=True,
+        timeout= 3600
+    )
+
+
+def nexveridian_qwen_stream_local_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        base_url=LM_STUDIO_BASE_URL,
+        api_key="test",
+        temperature=0.7,
+        model=os.getenv("NEXVERIDIAN_QWEN_MODEL_ID", "nexveridian/qwen3.5-35b-a3b"),
+        top_p=0.85,
+        max_completion_tokens=20000,
+        model_kwargs={
+            "frequency_penalty": 0.8,
+            "presence_penalty": 0.6,
+        },
+        extra_body={
+            **LM_STUDIO_EXTRA_BODY,
+            "min_p": 0.05,
+            "repeat_penalty": 1.15
+        },
+        # streaming=True,
+        # stream_usage=True,
+        timeout=3600
+    )
+
+
+def mlx_community_qwen_stream_local_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        base_url=LM_STUDIO_BASE_URL,
+        api_key="test",
+        temperature=0.6,
+        model=os.getenv("MLX_QWEN_MODEL_ID", "mlx-community/qwen3.5-35b-a3b"),
+        top_p=0.9,
+        max_completion_tokens=15000,
+        model_kwargs={
+            "frequency_penalty": 0.3,
+            "presence_penalty": 0.2,
+        },
+        extra_body={
+            **LM_STUDIO_EXTRA_BODY,
+            "min_p": 0,
+            "repeat_penalty": 1.15
+        },
+        # streaming=True,
+        # stream_usage=True,
+        timeout=3600
+    )
+
+
+def google_gemma_4_26b_a4b():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        base_url=LM_STUDIO_BASE_URL,
+        api_key="test",
+        temperature=0.6,
+        model=os.getenv("GEMMA_4_MODEL_ID", "google/gemma-4-26b-a4b"),
+        top_p=0.9,
+        max_completion_tokens=15000,
+        model_kwargs={
+            "frequency_penalty": 0.3,
+            "presence_penalty": 0.2,
+        },
+        extra_body={
+            **LM_STUDIO_EXTRA_BODY,
+            "min_p": 0,
+            "repeat_penalty": 1.15
+        },
+        # streaming=True,
+        # stream_usage=True,
+        timeout=3600
+    )
+
+
+def deepseekR1_local_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        base_url=LM_STUDIO_BASE_URL,
+        api_key="test",
+        temperature=0.7,
+        model=os.getenv("DEEPSEEK_MODEL_ID", "deepseek/deepseek-r1-0528-qwen3-8b")
+    )
+
+
+def gpt_oss_20b_local_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        base_url=LM_STUDIO_BASE_URL,
+        api_key="lm-studio",
+        model=os.getenv("GPT_OSS_MODEL_ID", "openai/gpt-oss-20b"),
+        extra_body={**LM_STUDIO_EXTRA_BODY, "reasoning_effort": "high"},
+        max_completion_tokens=12800,
+        temperature=0.5,
+        # streaming=True,
+    )
+
+
+def mistral_local_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        base_url=LM_STUDIO_BASE_URL,
+        api_key="test",
+        temperature=0.7,
+        model=os.getenv("MISTRAL_MODEL_ID", "mlx-community/Mistral-7B-Instruct-v0.3-4bit"),
+        top_p=0.85,
+        max_completion_tokens=15000,
+        model_kwargs={
+            "frequency_penalty": 1,
+            "presence_penalty": 0.5,
+        },
+        extra_body={
+            **LM_STUDIO_EXTRA_BODY,
+            "min_p": 0.05,
+            "repeat_penalty": 1.1
+        },
+        # streaming=True,
+        # stream_usage=True,
+        timeout=3600
+    )
 
 
 models_collection = {
     "groq_llm": groq_llm,
+    "groq_llm_map": groq_llm_map,
+    "groq_llm_reduce": groq_llm_reduce,
     "gemma_local_llm": gemma_local_llm,
     "nemotron_local_llm": nemotron_local_llm,
     "nemotron_stream_local_llm": nemotron_stream_local_llm,
@@ -174,8 +238,22 @@ models_collection = {
     "mistral_local_llm": mistral_local_llm
 }
 
+
+@functools.lru_cache(maxsize=None)
 def get_model(model_name):
-    if model_name in models_collection:
-        return models_collection[model_name]
-    else:
+    factory = models_collection.get(model_name)
+    if factory is None:
         raise ValueError(f"Unknown model: {model_name}")
+    return factory()
+
+
+# Per-phase overrides used by condense_content(); models not listed here use
+# the same instance for MAP and REDUCE.
+CONDENSER_PHASE_MODELS = {
+    "groq_llm": {"map": "groq_llm_map", "reduce": "groq_llm_reduce"},
+}
+
+
+def get_phase_model(model_name, phase):
+    """Return the model to use for condenser phase "map" or "reduce"."""
+    return get_model(CONDENSER_PHASE_MODELS.get(model_name, {}).get(phase, model_name))
@@ -86,3 +86,24 @@ def translate_worker(video_id: str, raw_hindi_text: str) -> str:
     result = _translate_hindi_to_english(raw_hindi_text)
     print(f"[INFO]    [{_ts()}] [TRANSLATE subprocess] Complete, len={len(result)} chars")
     return result
+
+
+def embed_worker(windows: list[str]) -> list[float]:
+    """Embed a text, given as sample windows, in an isolated subprocess.
+
+    Used by llm_cache's optional semantic tier.  Each window is embedded on
+    its own (the model only reads its first ~256 tokens) and the mean is
+    returned unit-normalised, as a plain list so only a few KB cross the
+    queue boundary.
+    """
+    load_dotenv()
+    model_id = os.getenv("LLM_CACHE_EMBED_MODEL_ID", "sentence-transformers/all-MiniLM-L6-v2")
+    print(f"[INFO]    [{_ts()}] [EMBED subprocess] Starting, model={model_id}, windows={len(windows)}")
+    from sentence_transformers import SentenceTransformer
+    import numpy as np
+    model = SentenceTransformer(model_id)
+    vectors = model.encode(windows, normalize_embeddings=True)
+    vector = np.mean(vectors, axis=0)
+    vector /= np.linalg.norm(vector) or 1.0
+    print(f"[INFO]    [{_ts()}] [EMBED subprocess] Complete, dims={len(vector)}")
+    return vector.tolist()
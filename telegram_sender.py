@@ -1,9 +1,19 @@
+import asyncio
+import json
+import mimetypes
 import os
+import random
 import requests
+import threading
 import time
+from contextlib import ExitStack
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+from urllib3.util.retry import Retry
 from datetime import datetime
-from typing import Optional, List
 from pathlib import Path
+from utils import DEBUG_LOGGING
 
 # Import compress_audio from utils
 try:
@@ -15,10 +25,352 @@ except ImportError:
 
 # Telegram limits
 TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+TELEGRAM_MAX_CAPTION_LENGTH = 1024
 TELEGRAM_MAX_FILE_SIZE_MB = 50
+TELEGRAM_BULK_CONCURRENCY = 25  # Chats served at once by send_telegram_bulk (API allows ~30 msg/s)
+# The upload body is pulled in 8 KiB pieces (http.client's block size); a 1 MiB
+# read buffer turns that into one disk read() per MiB instead of one per piece.
+_UPLOAD_READ_BUFFER = 1 << 20
+TELEGRAM_FORWARD_WAIT_SECONDS = 20  # Budget for a channel post's auto-forward to show up
+TELEGRAM_LONG_POLL_TIMEOUT = 15     # getUpdates long-poll timeout (server holds the request)
 
+# Attachment extension → (Bot API endpoint, MIME type, multipart field name)
+_EXT_MAP = {
+    '.wav': ('sendAudio', 'audio/wav', 'audio'),
+    '.mp3': ('sendAudio', 'audio/mpeg', 'audio'),
+    '.ogg': ('sendAudio', 'audio/ogg', 'audio'),
+    '.m4a': ('sendAudio', 'audio/mp4', 'audio'),
+    '.jpg': ('sendPhoto', 'image/jpeg', 'photo'),
+    '.jpeg': ('sendPhoto', 'image/jpeg', 'photo'),
+    '.png': ('sendPhoto', 'image/png', 'photo'),
+    '.gif': ('sendPhoto', 'image/gif', 'photo'),
+}
+# Anything else goes out as a document; its MIME type comes from mimetypes
+# (see _guess_mime_type)
+_DEFAULT_ENDPOINT, _DEFAULT_FILE_KEY = 'sendDocument', 'document'
+# sendMediaGroup takes 2-10 items, and audio / documents can't be mixed with
+# other types — so only adjacent attachments of one media type (multipart field) are grouped.
+TELEGRAM_MEDIA_GROUP_MAX = 10
 
-def get_discussion_group_id(channel_id: str, bot_token: str) -> Optional[str]:
+# One pooled session for the Bot API's small JSON calls: the TLS connection
+# to api.telegram.org is opened once and kept alive across the URL post,
+# getUpdates polls, getChat lookups and every text chunk, instead of a fresh
+# handshake each.
+# Retries live in _tg_request (not the adapter), which knows Telegram's
+# 429 retry_after field.
+_SESSION = requests.Session()
+_SESSION.headers.update({"Connection": "keep-alive"})
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# File uploads stream from disk (see _post_file), so urllib3 can't replay a
+# body it has already sent: this session only retries failed connects. 429/5xx
+# responses are retried by _with_retries, which reopens the file each attempt.
+_UPLOAD_SESSION = requests.Session()
+_UPLOAD_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.3),
+))
+
+
+# Bot API methods this module calls; endpoint URLs are built per token once
+_API_METHODS = (
+    'sendMessage', 'sendAudio', 'sendPhoto', 'sendDocument', 'sendMediaGroup', 'getUpdates', 'getChat',
+)
+
+
+@lru_cache(maxsize=4)
+def _endpoints(bot_token: str) -> dict[str, str]:
+    """Bot API method name → endpoint URL for a bot token (one bot per process, typically)."""
+    api_base = f"https://api.telegram.org/bot{bot_token}"
+    return {method: f"{api_base}/{method}" for method in _API_METHODS}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, holding at most `burst`.
+    
+    reserve() takes a token and returns how long the caller must wait before
+    using it (0 when one is available). Tokens may go negative, so concurrent
+    callers queue up behind each other instead of all waking at once; the
+    caller sleeps, with time.sleep or asyncio.sleep as appropriate.
+    """
+    
+    def __init__(self, rate: float = 25, burst: float = 30):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+    
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Client-side limits, below Telegram's ~30 messages/s per bot, ~20
+# messages/min per group or channel and ~1 message/s per private chat, so
+# bursts are smoothed here instead of being answered with 429 + retry_after.
+_GLOBAL_BUCKET = TokenBucket(rate=25, burst=30)
+_GROUP_RATE, _GROUP_BURST = 20 / 60, 20
+_PRIVATE_RATE, _PRIVATE_BURST = 1, 3
+_chat_buckets: dict[str, TokenBucket] = {}
+_chat_buckets_lock = threading.Lock()
+
+
+def _is_group_chat(chat_id: str) -> bool:
+    """Groups, supergroups and channels have negative ids (or an @username); users positive ones."""
+    return chat_id.startswith(('-', '@'))
+
+
+def _rate_limit_delay(chat_id) -> float:
+    """Reserve a send slot for chat_id (global + per-chat); returns seconds to wait first."""
+    key = str(chat_id)
+    bucket = _chat_buckets.get(key)
+    if bucket is None:
+        if _is_group_chat(key):
+            new_bucket = TokenBucket(rate=_GROUP_RATE, burst=_GROUP_BURST)
+        else:
+            new_bucket = TokenBucket(rate=_PRIVATE_RATE, burst=_PRIVATE_BURST)
+        with _chat_buckets_lock:
+            bucket = _chat_buckets.setdefault(key, new_bucket)
+    return max(_GLOBAL_BUCKET.reserve(), bucket.reserve())
+
+
+# Backoff for _with_retries: min(cap, base * 2**attempt) plus up to 50% jitter
+TELEGRAM_MAX_RETRIES = 5
+_RETRY_BASE_DELAY = 1.0
+_RETRY_MAX_DELAY = 30.0
+
+
+def _retry_after(status_code: int, body: bytes, headers) -> float | None:
+    """A 429's retry_after: the JSON parameters field first, then the Retry-After header."""
+    if status_code != 429:
+        return None
+    retry_after = None
+    try:
+        retry_after = json.loads(body).get('parameters', {}).get('retry_after')
+    except (ValueError, AttributeError):
+        pass
+    retry_after = retry_after or headers.get('Retry-After')
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return None
+
+
+def _retry_delay(attempt: int, retry_after: float | None = None) -> float:
+    """Seconds to wait before the next attempt; a 429's retry_after wins over backoff."""
+    if retry_after:
+        return retry_after
+    return min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** attempt) * (1 + random.uniform(0, 0.5))
+
+
+def _with_retries(send, chat_id=None, max_retries: int = TELEGRAM_MAX_RETRIES) -> requests.Response:
+    """
+    Call send() until Telegram answers with something other than 429/5xx.
+    
+    Network errors and 429/5xx responses are retried up to max_retries times
+    (429s wait for Telegram's retry_after, everything else backs off
+    exponentially with jitter). The last response is returned once retries
+    run out; the last network error is re-raised.
+    
+    Requests addressed to a chat_id first wait for a rate-limiter slot
+    (every attempt counts against the limits).
+    """
+    for attempt in range(max_retries + 1):
+        if chat_id is not None:
+            wait = _rate_limit_delay(chat_id)
+            if wait > 0:
+                time.sleep(wait)
+        try:
+            response = send()
+        except requests.exceptions.RequestException as e:
+            if attempt == max_retries:
+                raise
+            delay = _retry_delay(attempt)
+            print(f"[WARNING] Telegram request failed ({e}), retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+        else:
+            if (response.status_code != 429 and response.status_code < 500) or attempt == max_retries:
+                return response
+            delay = _retry_delay(attempt, _retry_after(response.status_code, response.content, response.headers))
+            print(f"[WARNING] Telegram returned {response.status_code}, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+        time.sleep(delay)
+
+
+async def _with_retries_async(send, chat_id=None, max_retries: int = TELEGRAM_MAX_RETRIES) -> tuple[int, bytes]:
+    """
+    Async counterpart of _with_retries for send_telegram_bulk's aiohttp calls.
+    
+    send() is a coroutine function returning (status, body, headers); it is
+    called again for every attempt, so it must build a fresh request body.
+    Same policy as _with_retries: rate-limiter slot first, retry_after for
+    429s, jittered backoff for 5xx and network errors. Returns the last
+    (status, body); the last network error is re-raised.
+    """
+    import aiohttp
+    
+    for attempt in range(max_retries + 1):
+        if chat_id is not None:
+            wait = _rate_limit_delay(chat_id)
+            if wait > 0:
+                await asyncio.sleep(wait)
+        try:
+            status, body, headers = await send()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt == max_retries:
+                raise
+            delay = _retry_delay(attempt)
+            print(f"[WARNING] [{chat_id}] Telegram request failed ({e!r}), retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+        else:
+            if (status != 429 and status < 500) or attempt == max_retries:
+                return status, body
+            delay = _retry_delay(attempt, _retry_after(status, body, headers))
+            print(f"[WARNING] [{chat_id}] Telegram returned {status}, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+        await asyncio.sleep(delay)
+
+
+def _tg_request(session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+    """session.request() with Telegram-aware retries and rate limiting (see _with_retries)."""
+    fields = kwargs.get('data') or kwargs.get('params')
+    chat_id = fields.get('chat_id') if isinstance(fields, dict) else None
+    return _with_retries(lambda: session.request(method, url, **kwargs), chat_id)
+
+
+def _post_file(url: str, fields: dict, file_key: str, file_name: str, file_path: str, mime_type: str) -> requests.Response:
+    """
+    POST a multipart upload that streams the file from disk.
+    
+    MultipartEncoder reads the file in small blocks as the socket drains, so
+    memory stays flat regardless of file size instead of requests building
+    the whole multipart body in RAM first.
+    """
+    return _post_files(url, fields, [(file_key, file_name, file_path, mime_type)])
+
+
+def _post_files(url: str, fields: dict, files: list[tuple]) -> requests.Response:
+    """Streaming multipart POST of several files, given as (field, file_name, file_path, mime_type)."""
+    def send() -> requests.Response:
+        # A fresh encoder (and file handles) per attempt: a streamed body can't be rewound
+        with ExitStack() as stack:
+            encoder = MultipartEncoder(fields={
+                **{key: str(value) for key, value in fields.items()},
+                **{
+                    field: (file_name, stack.enter_context(open(file_path, 'rb', buffering=_UPLOAD_READ_BUFFER)), mime_type)
+                    for field, file_name, file_path, mime_type in files
+                },
+            })
+            return _UPLOAD_SESSION.post(url, data=encoder, headers={'Content-Type': encoder.content_type})
+    
+    return _with_retries(send, fields.get('chat_id'))
+
+
+def _error_body(response: requests.Response) -> str:
+    """First 512 bytes of a failed response's body, for error logs."""
+    return response.content[:512].decode(errors='replace')
+
+
+# getUpdates state shared by every send in this process. Only one thread
+# long-polls at a time (Telegram answers concurrent getUpdates with 409), the
+# offset keeps each update from being fetched twice, and auto-forwards seen by
+# any poll are parked in _forwarded_messages for whichever send is waiting.
+#
+# Channel mode takes over the bot token's update stream: passing an offset
+# confirms (and deletes from Telegram's queue) every earlier update, whether
+# or not it was an auto-forward. Use a token that no webhook, bot framework
+# or other getUpdates poller also relies on.
+_updates_lock = threading.Lock()
+_last_update_id: int | None = None
+_forwarded_messages: dict[tuple[str, int], int] = {}  # (chat_id, channel msg id) → discussion msg id
+_FORWARDED_MESSAGES_MAX = 256
+
+
+def _poll_updates(get_updates_url: str, timeout: int) -> bool:
+    """
+    One getUpdates long-poll; records auto-forwards. Caller holds _updates_lock.
+    
+    Every update fetched is confirmed on the next poll, including the ones
+    skipped here (see the note above _updates_lock). Non-message updates are
+    filtered out client-side: allowed_updates is not sent, because Telegram
+    stores it as the bot's subscription rather than applying it per request.
+    """
+    global _last_update_id
+    
+    params = {'timeout': timeout, 'limit': 100}
+    if _last_update_id is not None:
+        params['offset'] = _last_update_id + 1
+    
+    updates_response = _tg_request(_SESSION, 'GET', get_updates_url, params=params, timeout=timeout + 5)
+    
+    if updates_response.status_code >= 400:
+        print(f"[WARNING] getUpdates failed: {_error_body(updates_response)}")
+        return False
+    
+    for update in updates_response.json().get('result', []):
+        _last_update_id = max(_last_update_id or 0, update['update_id'])
+        msg = update.get('message')
+        if not msg:
+            continue
+        
+        # forward_origin replaced forward_from_message_id in Bot API 7.0
+        forward_from_message_id = msg.get('forward_from_message_id') or msg.get('forward_origin', {}).get('message_id')
+        if forward_from_message_id:
+            msg_chat_id = str(msg.get('chat', {}).get('id', ''))
+            _forwarded_messages[(msg_chat_id, forward_from_message_id)] = msg['message_id']
+    
+    # Forwards nobody waits for (e.g. posts made by hand) must not pile up
+    while len(_forwarded_messages) > _FORWARDED_MESSAGES_MAX:
+        del _forwarded_messages[next(iter(_forwarded_messages))]
+    
+    return True
+
+
+def _wait_for_forward(get_updates_url: str, chat_id: str, channel_message_id: int) -> int | None:
+    """
+    Long-poll getUpdates until the channel post's auto-forward shows up in the
+    discussion group, or TELEGRAM_FORWARD_WAIT_SECONDS runs out.
+    
+    Returns:
+        The forwarded message's id in the discussion group, or None
+    """
+    key = (str(chat_id), channel_message_id)
+    deadline = time.monotonic() + TELEGRAM_FORWARD_WAIT_SECONDS
+    
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not _updates_lock.acquire(timeout=remaining):
+            return _forwarded_messages.pop(key, None)
+        try:
+            if key in _forwarded_messages:
+                return _forwarded_messages.pop(key)
+            
+            remaining = int(deadline - time.monotonic())
+            if remaining < 1:
+                return None
+            
+            if not _poll_updates(get_updates_url, min(TELEGRAM_LONG_POLL_TIMEOUT, remaining)):
+                return None
+        finally:
+            _updates_lock.release()
+
+
+# channel_id → linked discussion group id. A channel's linked group only
+# changes when an admin relinks it, so one getChat per channel per process.
+_linked_chat_cache: dict[str, str] = {}
+
+
+def get_discussion_group_id(channel_id: str, bot_token: str) -> str | None:
     """
     Get the linked discussion group ID for a Telegram channel.
     
@@ -29,28 +381,69 @@ def get_discussion_group_id(channel_id: str, bot_token: str) -> Optional[str]:
     Returns:
         Discussion group chat ID if linked, None otherwise
     """
+    linked_id = _linked_chat_cache.get(str(channel_id))
+    if linked_id is not None:
+        return linked_id
+    
     try:
-        get_chat_url = f"https://api.telegram.org/bot{bot_token}/getChat"
-        response = requests.post(get_chat_url, data={'chat_id': channel_id})
+        get_chat_url = _endpoints(bot_token)['getChat']
+        response = _tg_request(_SESSION, 'POST', get_chat_url, data={'chat_id': channel_id})
         
-        if response.ok:
+        if response.status_code < 400:
             chat_info = response.json()
             if 'result' in chat_info and 'linked_chat_id' in chat_info['result']:
                 linked_id = chat_info['result']['linked_chat_id']
                 print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Found linked discussion group: {linked_id}")
+                _linked_chat_cache[str(channel_id)] = str(linked_id)
                 return str(linked_id)
             else:
                 print(f"[WARNING] Channel {channel_id} has no linked discussion group")
                 return None
         else:
-            print(f"[ERROR] Failed to get chat info: {response.text}")
+            print(f"[ERROR] Failed to get chat info: {_error_body(response)}")
             return None
     except Exception as e:
         print(f"[ERROR] Exception getting discussion group: {str(e)}")
         return None
 
 
-def split_message(message: str, max_length: int = TELEGRAM_MAX_MESSAGE_LENGTH) -> List[str]:
+def _iter_chunks(message: str, max_length: int = TELEGRAM_MAX_MESSAGE_LENGTH):
+    """
+    Yield consecutive chunks of message, each at most max_length chars.
+    
+    Walks a cursor through the message and searches with bounded rfind, so
+    the only strings built are the yielded chunks themselves. Splits at the
+    last whitespace in range (forced at max_length if there is none) and
+    skips the whitespace that follows.
+    """
+    n = len(message)
+    start = 0
+    
+    while start < n:
+        # If remaining text fits in one message, yield it and stop
+        if n - start <= max_length:
+            yield message[start:]
+            return
+        
+        # Take as much as possible up to max_length
+        end = start + max_length
+        
+        # Find the last whitespace to avoid breaking words
+        split_pos = max(message.rfind(' ', start, end), message.rfind('\n', start, end))
+        
+        if split_pos > start:
+            # Split at word boundary, skipping the whitespace that follows
+            yield message[start:split_pos]
+            start = split_pos
+            while start < n and message[start].isspace():
+                start += 1
+        else:
+            # No space found, force split at max_length
+            yield message[start:end]
+            start = end
+
+
+def split_message(message: str, max_length: int = TELEGRAM_MAX_MESSAGE_LENGTH) -> list[str]:
     """
     Split a long message into multiple chunks respecting Telegram's character limit.
     Maximizes use of character limit and splits at word boundaries.
@@ -64,45 +457,81 @@ def split_message(message: str, max_length: int = TELEGRAM_MAX_MESSAGE_LENGTH) -
     """
     if len(message) <= max_length:
         return [message]
+    return list(_iter_chunks(message, max_length))
+
+
+def split_caption(message: str, max_length: int = TELEGRAM_MAX_CAPTION_LENGTH) -> tuple[str, str]:
+    """
+    Split a message into a head that fits in a media caption and the rest.
     
-    chunks = []
-    remaining = message
+    The head ends at the last whitespace within max_length (forced at
+    max_length if there is none), so no word is cut in half.
     
-    while remaining:
-        # If remaining text fits in one message, add it and break
-        if len(remaining) <= max_length:
-            chunks.append(remaining)
-            break
-        
-        # Take as much as possible up to max_length
-        chunk = remaining[:max_length]
+    Returns:
+        (caption, remainder) — remainder is '' if the whole message fits
+    """
+    if len(message) <= max_length:
+        return message, ''
+    
+    split_pos = max(message.rfind(' ', 0, max_length), message.rfind('\n', 0, max_length))
+    if split_pos <= 0:
+        split_pos = max_length
+    
+    return message[:split_pos], message[split_pos:].lstrip()
+
+
+def _send_text(text_url: str, base: dict, message: str, destination: str) -> int | None:
+    """
+    Send a message as one or more sendMessage parts, in order.
+    
+    Args:
+        text_url: sendMessage endpoint
+        base: Fields shared by every part (chat_id, reply_to_message_id)
+        message: Text to send; split with split_message() only if it's too long
+        destination: Where the text is going, for log lines
         
-        # Find the last space to avoid breaking words
-        last_space = chunk.rfind(' ')
-        last_newline = chunk.rfind('\n')
+    Returns:
+        Number of parts sent, or None if Telegram rejected one
+    """
+    # Common case: the whole message fits in one part, so skip the split
+    if len(message) <= TELEGRAM_MAX_MESSAGE_LENGTH:
+        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending text content to {destination} (1 part(s))...")
+        text_response = _tg_request(_SESSION, 'POST', text_url, data={**base, 'text': message})
         
-        # Use the last whitespace (prefer newline over space)
-        split_pos = max(last_space, last_newline)
+        if text_response.status_code >= 400:
+            print(f"[ERROR] Failed to send message: {_error_body(text_response)}")
+            return None
+        return 1
+    
+    message_chunks = split_message(message)
+    
+    if DEBUG_LOGGING:
+        print(f"[DEBUG] Message length: {len(message)} chars")
+        print(f"[DEBUG] Split into {len(message_chunks)} chunks")
+    
+    print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending text content to {destination} ({len(message_chunks)} part(s))...")
+    
+    # Send all message chunks in order
+    for i, chunk in enumerate(message_chunks, 1):
+        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending message part {i}/{len(message_chunks)}...")
+        if DEBUG_LOGGING:
+            print(f"[DEBUG] Chunk {i} length: {len(chunk)} chars")
+        text_response = _tg_request(_SESSION, 'POST', text_url, data={**base, 'text': chunk})
         
-        if split_pos > 0:
-            # Split at word boundary
-            chunks.append(chunk[:split_pos])
-            remaining = remaining[split_pos:].lstrip()
-        else:
-            # No space found, force split at max_length
-            chunks.append(chunk)
-            remaining = remaining[max_length:]
+        if text_response.status_code >= 400:
+            print(f"[ERROR] Failed to send message part {i}: {_error_body(text_response)}")
+            return None
     
-    return chunks
+    return len(message_chunks)
 
 
 def send_telegram_with_audio(
     chat_id: str,
     message: str,
     audio_file_path: str,
-    bot_token: Optional[str] = None,
-    source_url: Optional[str] = None,
-    channel_id: Optional[str] = None
+    bot_token: str | None = None,
+    source_url: str | None = None,
+    channel_id: str | None = None
 ) -> bool:
     """
     Send a Telegram message with a single audio file attachment.
@@ -117,6 +546,10 @@ def send_telegram_with_audio(
         2) Send audio file to chat_id
         3) Send text content to chat_id
     
+    The head of the message (up to TELEGRAM_MAX_CAPTION_LENGTH chars) is sent
+    as the audio's caption; only the remainder, if any, goes out as text
+    messages. Short messages therefore take a single request.
+    
     Args:
         chat_id: Telegram chat ID (fallback if no channel_id)
         message: Text message to send
@@ -124,6 +557,8 @@ def send_telegram_with_audio(
         bot_token: Telegram bot token (defaults to env var TELEGRAM_BOT_TOKEN)
         source_url: Optional source URL to send first
         channel_id: Optional channel ID for posting to channel + discussion group
+            (consumes the bot's getUpdates queue while waiting for the
+            auto-forward, see _poll_updates)
         
     Returns:
         True if message sent successfully, False otherwise
@@ -143,14 +578,16 @@ def send_telegram_with_audio(
         print("[ERROR] Chat ID is required")
         return False
     
-    # Validate audio file exists
+    # Validate audio file exists (one stat for existence + size)
     audio_path = Path(audio_file_path)
-    if not audio_path.exists():
+    try:
+        audio_size = os.stat(audio_file_path).st_size
+    except FileNotFoundError:
         print(f"[ERROR] Audio file not found: {audio_file_path}")
         return False
     
     # Check file size and compress if needed
-    file_size_mb = audio_path.stat().st_size / (1024 * 1024)
+    file_size_mb = audio_size / (1024 * 1024)
     print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Audio file size: {file_size_mb:.2f} MB")
     
     compressed_file = None
@@ -192,192 +629,93 @@ def send_telegram_with_audio(
         audio_file_path = compressed_file
         print(f"[SUCCESS] Using compressed audio: {compressed_size_mb:.2f} MB")
     
+    # The upload may be the original .wav or the compressed .mp3
+    audio_mime_type = _guess_mime_type(audio_path.name)
+    
     try:
-        text_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-        audio_url = f"https://api.telegram.org/bot{bot_token}/sendAudio"
+        endpoints = _endpoints(bot_token)
+        text_url = endpoints['sendMessage']
+        audio_url = endpoints['sendAudio']
         
-        # Determine target chat for comments (discussion group or fallback to chat_id)
-        comment_chat_id = chat_id
+        # The message head rides along as the audio caption: a short message
+        # needs no text request at all, a long one needs one fewer part
+        caption, remainder = split_caption(message)
         
-        # If channel_id provided, use channel + discussion group workflow
+        # Channel mode posts the source URL to the channel and replies under its
+        # auto-forward in the discussion group (chat_id); direct mode sends
+        # everything to chat_id. Apart from that, both modes run the same sends.
         if channel_id:
             print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Using channel mode: post to channel {channel_id}, reply in group {chat_id}")
             
-            # Step 1: Send URL link to CHANNEL (will auto-forward to discussion group)
             if not source_url:
                 print(f"[ERROR] source_url is required for channel mode")
                 return False
-                
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending source URL to channel {channel_id}...")
-            url_response = requests.post(text_url, data={
-                'chat_id': channel_id,
+            
+            url_chat_id, destination = channel_id, "discussion group"
+        else:
+            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Using direct chat mode: sending to {chat_id}")
+            url_chat_id, destination = chat_id, chat_id
+        
+        # Fields shared by the audio and every text part
+        base = {'chat_id': chat_id}
+        
+        # Step 1: Send URL link (in channel mode this is the post everything else replies to)
+        if source_url:
+            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending source URL to {'channel' if channel_id else 'chat'} {url_chat_id}...")
+            url_response = _tg_request(_SESSION, 'POST', text_url, data={
+                'chat_id': url_chat_id,
                 'text': f"🔗 Source: {source_url}"
             })
             
-            if not url_response.ok:
-                print(f"[ERROR] Failed to send URL to channel: {url_response.text}")
+            if url_response.status_code >= 400:
+                print(f"[ERROR] Failed to send URL: {_error_body(url_response)}")
                 return False
             
-            # Get channel message_id from response
+            print(f"[SUCCESS] Source URL sent")
+        
+        # Step 2 (channel mode): Long-poll getUpdates for the post's auto-forward in
+        # the discussion group, and thread the audio and text under it
+        if channel_id:
             channel_message_id = url_response.json()['result']['message_id']
-            print(f"[SUCCESS] Source URL posted to channel, message_id: {channel_message_id}")
-            
-            # Step 2: Wait for auto-forward to discussion group
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Waiting 3 seconds for auto-forward to discussion group...")
-            time.sleep(3)
-            
-            # Step 3: Find the forwarded message in discussion group using getUpdates
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Looking for forwarded message in discussion group {chat_id}...")
-            get_updates_url = f"https://api.telegram.org/bot{bot_token}/getUpdates"
-            
-            discussion_message_id = None
-            max_attempts = 3
+            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Waiting up to {TELEGRAM_FORWARD_WAIT_SECONDS}s for auto-forward of channel message {channel_message_id} to discussion group {chat_id}...")
+            discussion_message_id = _wait_for_forward(endpoints['getUpdates'], chat_id, channel_message_id)
             
-            for attempt in range(1, max_attempts + 1):
-                print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Attempt {attempt}/{max_attempts}...")
-                
-                updates_response = requests.get(get_updates_url, params={'limit': 100}, timeout=10)
-                
-                if updates_response.ok:
-                    updates = updates_response.json().get('result', [])
-                    
-                    # Find message with forward_from_message_id matching our channel post
-                    for update in reversed(updates):
-                        if 'message' in update:
-                            msg = update['message']
-                            msg_chat_id = str(msg.get('chat', {}).get('id', ''))
-                            forward_from_message_id = msg.get('forward_from_message_id')
-                            
-                            # Check if this is the forwarded message from our channel post
-                            if (msg_chat_id == str(chat_id) and 
-                                forward_from_message_id == channel_message_id):
-                                
-                                discussion_message_id = msg['message_id']
-                                print(f"[SUCCESS] Found forwarded message: channel_msg={channel_message_id} → discussion_msg={discussion_message_id}")
-                                break
-                
-                if discussion_message_id:
-                    break
-                
-                if attempt < max_attempts:
-                    print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Not found yet, waiting 2 more seconds...")
-                    time.sleep(2)
-            
-            if not discussion_message_id:
-                print(f"[WARNING] Could not find forwarded message after {max_attempts} attempts")
+            if discussion_message_id:
+                print(f"[SUCCESS] Found forwarded message: channel_msg={channel_message_id} → discussion_msg={discussion_message_id}")
+                base['reply_to_message_id'] = discussion_message_id
+            else:
+                print(f"[WARNING] Could not find forwarded message within {TELEGRAM_FORWARD_WAIT_SECONDS}s")
                 print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending audio and text without threading")
-            
-            # Step 4: Send audio file to discussion group as reply
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending audio to discussion group {chat_id}...")
-            
-            with open(audio_file_path, 'rb') as audio_file:
-                files = {'audio': (audio_path.name, audio_file, 'audio/wav')}
-                data = {'chat_id': chat_id}
-                
-                if discussion_message_id:
-                    data['reply_to_message_id'] = discussion_message_id
-                
-                audio_response = requests.post(audio_url, data=data, files=files)
-                
-                if not audio_response.ok:
-                    print(f"[ERROR] Failed to send audio: {audio_response.text}")
-                    return False
-            
-            print(f"[SUCCESS] Audio sent to discussion group")
-            
-            # Step 5: Send text content to discussion group as reply
-            message_chunks = split_message(message)
-            
-            print(f"[DEBUG] Message length: {len(message)} chars")
-            print(f"[DEBUG] Split into {len(message_chunks)} chunks")
-            for idx, chunk in enumerate(message_chunks, 1):
-                print(f"[DEBUG] Chunk {idx} length: {len(chunk)} chars")
-            
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending text content to discussion group ({len(message_chunks)} part(s))...")
-            
-            for i, chunk in enumerate(message_chunks, 1):
-                print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending message part {i}/{len(message_chunks)}...")
-                
-                data = {
-                    'chat_id': chat_id,
-                    'text': chunk
-                }
-                
-                if discussion_message_id:
-                    data['reply_to_message_id'] = discussion_message_id
-                
-                text_response = requests.post(text_url, data=data)
-                
-                if not text_response.ok:
-                    print(f"[ERROR] Failed to send message part {i}: {text_response.text}")
-                    return False
-            
-            print(f"[SUCCESS] All messages sent as replies ({len(message_chunks)} part(s))")
-            
-        else:
-            # No channel mode - use old behavior
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Using direct chat mode: sending to {chat_id}")
-            
-            # Step 1: Send URL link if provided
-            if source_url:
-                print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending source URL to chat {chat_id}...")
-                url_response = requests.post(text_url, data={
-                    'chat_id': chat_id,
-                    'text': f"🔗 Source: {source_url}"
-                })
-                
-                if not url_response.ok:
-                    print(f"[ERROR] Failed to send URL: {url_response.text}")
-                    return False
-                
-                print(f"[SUCCESS] Source URL sent")
         
-            # Step 2: Send audio file to chat_id
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending audio file to {chat_id}: {audio_path.name}")
-            
-            with open(audio_file_path, 'rb') as audio_file:
-                files = {'audio': (audio_path.name, audio_file, 'audio/wav')}
-                data = {'chat_id': chat_id}
-                
-                audio_response = requests.post(audio_url, data=data, files=files)
-                
-                if not audio_response.ok:
-                    print(f"[ERROR] Failed to send audio: {audio_response.text}")
-                    return False
-            
-            print(f"[SUCCESS] Audio file sent successfully")
-            
-            # Step 3: Send text content (split into chunks if needed)
-            message_chunks = split_message(message)
-            
-            print(f"[DEBUG] Message length: {len(message)} chars")
-            print(f"[DEBUG] Split into {len(message_chunks)} chunks")
-            for idx, chunk in enumerate(message_chunks, 1):
-                print(f"[DEBUG] Chunk {idx} length: {len(chunk)} chars")
-            
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending text content to {chat_id} ({len(message_chunks)} part(s))...")
-            
-            # Send all message chunks in order
-            for i, chunk in enumerate(message_chunks, 1):
-                print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending message part {i}/{len(message_chunks)}...")
-                text_response = requests.post(text_url, data={
-                    'chat_id': chat_id,
-                    'text': chunk
-                })
-                
-                if not text_response.ok:
-                    print(f"[ERROR] Failed to send message part {i}: {text_response.text}")
-                    return False
+        # Step 3: Send audio file, with the message head as its caption
+        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending audio file to {destination}: {audio_path.name}")
+        
+        audio_fields = {**base, 'caption': caption} if caption else base
+        audio_response = _post_file(audio_url, audio_fields, 'audio', audio_path.name, audio_file_path, audio_mime_type)
+        
+        if audio_response.status_code >= 400:
+            print(f"[ERROR] Failed to send audio: {_error_body(audio_response)}")
+            return False
+        
+        print(f"[SUCCESS] Audio file sent successfully")
+        if caption:
+            print(f"[SUCCESS] Message head sent as the audio caption ({len(caption)} chars)")
+        
+        # Step 4: Send the rest of the text content (split into chunks if needed)
+        if remainder:
+            parts = _send_text(text_url, base, remainder, destination)
+            if parts is None:
+                return False
             
-            print(f"[SUCCESS] All message parts sent ({len(message_chunks)} message(s))")
+            print(f"[SUCCESS] All message parts sent ({parts} message(s))")
         
-        # Send separator messages to denote end of transaction
-        # separator = "─" * 30
-        # for _ in range(3):
-        #     separator_response = requests.post(text_url, data={
-        #         'chat_id': chat_id if not channel_id else channel_id,
-        #         'text': separator
-        #     })
+        # Send separator lines to denote end of transaction
+        # (three lines in one message, one request instead of three)
+        # separator = "\n".join(["─" * 30] * 3)
+        # separator_response = _tg_request(_SESSION, 'POST', text_url, data={
+        #     'chat_id': chat_id if not channel_id else channel_id,
+        #     'text': separator
+        # })
         
         print(f"[SUCCESS] Message with audio sent successfully to Telegram")
         
@@ -412,11 +750,135 @@ def send_telegram_with_audio(
         return False
 
 
+def _guess_mime_type(file_name: str) -> str:
+    """
+    MIME type for a file name by extension (no file reads).
+    
+    Extensions in _EXT_MAP keep their fixed types (e.g. audio/wav); only
+    unknown ones fall back to the host's mimetypes table.
+    """
+    attachment_type = _EXT_MAP.get(os.path.splitext(file_name)[1].lower())
+    if attachment_type is not None:
+        return attachment_type[1]
+    return mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+
+
+def _file_name(file_path: str) -> str:
+    """Final path component of a file path, without building a Path."""
+    if os.altsep:
+        # Windows accepts both separators; let ntpath sort them out
+        return os.path.basename(file_path)
+    return file_path.rpartition(os.sep)[2]
+
+
+def _attachment_type(file_path: str) -> tuple:
+    """(endpoint, mime_type, file_key) for a file, by extension."""
+    file_ext = os.path.splitext(file_path)[1].lower()
+    attachment_type = _EXT_MAP.get(file_ext)
+    if attachment_type is None:
+        return _DEFAULT_ENDPOINT, _guess_mime_type(file_path), _DEFAULT_FILE_KEY
+    return attachment_type
+
+
+def _check_attachment(file_path: str) -> int | None:
+    """Return the file size if the attachment can be sent, else log why not and return None."""
+    try:
+        file_size = os.stat(file_path).st_size
+    except FileNotFoundError:
+        print(f"[WARNING] Attachment not found, skipping: {file_path}")
+        return None
+    
+    # Check file size (Telegram bot limit is 50MB)
+    if file_size > 50 * 1024 * 1024:
+        print(f"[WARNING] File too large (>50MB), skipping: {_file_name(file_path)}")
+        return None
+    
+    return file_size
+
+
+def _group_attachments(attachments: list[tuple]) -> list[list[tuple]]:
+    """
+    Group (file_path, file_size, attachment_type) entries into upload units,
+    keeping the caller's order: each run of adjacent same-type files becomes
+    sendMediaGroup units of up to TELEGRAM_MEDIA_GROUP_MAX files, so
+    [a.wav, b.png, c.wav] is three sends in that order.
+    """
+    groups: list[list[tuple]] = []
+    for attachment in attachments:
+        if (
+            groups
+            and groups[-1][0][2][2] == attachment[2][2]
+            and len(groups[-1]) < TELEGRAM_MEDIA_GROUP_MAX
+        ):
+            groups[-1].append(attachment)
+        else:
+            groups.append([attachment])
+    
+    return groups
+
+
+def _send_attachment(endpoints: dict[str, str], chat_id: str, file_path: str, file_size: int, attachment_type: tuple) -> bool:
+    """
+    Upload one checked file to a chat with the endpoint that matches its type.
+    
+    Rejected files are logged and skipped (False); network errors propagate
+    to the caller.
+    """
+    file_name = _file_name(file_path)
+    print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending file: {file_name} ({file_size / 1024:.2f} KB)")
+    
+    endpoint, mime_type, file_key = attachment_type
+    
+    response = _post_file(endpoints[endpoint], {'chat_id': chat_id}, file_key, file_name, file_path, mime_type)
+    
+    if response.status_code >= 400:
+        print(f"[ERROR] Failed to send {file_name}: {_error_body(response)}")
+        return False
+    
+    print(f"[SUCCESS] Sent {file_name}")
+    return True
+
+
+def _send_attachment_group(endpoints: dict[str, str], chat_id: str, group: list[tuple]) -> list[str]:
+    """
+    Send same-type attachments as one sendMediaGroup album (one round trip
+    instead of one per file). Falls back to a per-file upload for a group of
+    one or when Telegram rejects the album.
+    
+    group holds (file_path, file_size, attachment_type) entries that have
+    already passed _check_attachment().
+    
+    Returns:
+        Names of the files that could not be sent (empty on success)
+    """
+    if len(group) < 2:
+        return [_file_name(attachment[0]) for attachment in group if not _send_attachment(endpoints, chat_id, *attachment)]
+    
+    media_type = group[0][2][2]
+    names = [_file_name(file_path) for file_path, _, _ in group]
+    total_kb = sum(file_size for _, file_size, _ in group) / 1024
+    print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending {len(group)} files as a media group ({total_kb:.2f} KB): {', '.join(names)}")
+    
+    media = [{'type': media_type, 'media': f'attach://file{i}'} for i in range(len(group))]
+    files = [
+        (f'file{i}', name, file_path, attachment_type[1])
+        for i, (name, (file_path, _, attachment_type)) in enumerate(zip(names, group))
+    ]
+    response = _post_files(endpoints['sendMediaGroup'], {'chat_id': chat_id, 'media': json.dumps(media)}, files)
+    
+    if response.status_code >= 400:
+        print(f"[WARNING] Media group rejected ({_error_body(response)}), sending files individually")
+        return [name for name, attachment in zip(names, group) if not _send_attachment(endpoints, chat_id, *attachment)]
+    
+    print(f"[SUCCESS] Sent media group: {', '.join(names)}")
+    return []
+
+
 def send_telegram_with_attachments(
     chat_id: str,
     message: str,
-    attachment_paths: Optional[List[str]] = None,
-    bot_token: Optional[str] = None
+    attachment_paths: list[str] | None = None,
+    bot_token: str | None = None
 ) -> bool:
     """
     Send a Telegram message with optional file attachments.
@@ -446,74 +908,35 @@ def send_telegram_with_attachments(
         return False
     
     try:
-        text_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        endpoints = _endpoints(bot_token)
+        text_url = endpoints['sendMessage']
+        base = {'chat_id': chat_id}
         
-        # Split message if needed
-        message_chunks = split_message(message)
+        # Check attachments before any network I/O, so a missing or oversized
+        # file is reported (and skipped) up front rather than after the text.
+        # Each survivor's endpoint / MIME type / field is resolved here, once.
+        valid = []
+        for file_path in attachment_paths or []:
+            file_size = _check_attachment(file_path)
+            if file_size is not None:
+                valid.append((file_path, file_size, _attachment_type(file_path)))
         
-        print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending message to Telegram chat {chat_id} ({len(message_chunks)} part(s))...")
+        parts = _send_text(text_url, base, message, f"Telegram chat {chat_id}")
+        if parts is None:
+            return False
         
-        # Send all message chunks
-        for i, chunk in enumerate(message_chunks, 1):
-            print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending message part {i}/{len(message_chunks)}...")
-            text_response = requests.post(text_url, data={
-                'chat_id': chat_id,
-                'text': chunk
-            })
-            
-            if not text_response.ok:
-                print(f"[ERROR] Failed to send message part {i}: {text_response.text}")
-                return False
+        print(f"[SUCCESS] All message parts sent ({parts} message(s))")
         
-        print(f"[SUCCESS] All message parts sent ({len(message_chunks)} message(s))")
+        # Send attachments if provided: adjacent same-type files go out as media
+        # groups, one group at a time, so files reach the chat in the caller's order
+        failed = []
+        for group in _group_attachments(valid):
+            failed.extend(_send_attachment_group(endpoints, chat_id, group))
         
-        # Send attachments if provided
-        if attachment_paths:
-            for file_path in attachment_paths:
-                if not os.path.exists(file_path):
-                    print(f"[WARNING] Attachment not found, skipping: {file_path}")
-                    continue
-                
-                file_name = os.path.basename(file_path)
-                file_size = os.path.getsize(file_path)
-                
-                # Check file size (Telegram bot limit is 50MB)
-                if file_size > 50 * 1024 * 1024:
-                    print(f"[WARNING] File too large (>50MB), skipping: {file_name}")
-                    continue
-                
-                print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Sending file: {file_name} ({file_size / 1024:.2f} KB)")
-                
-                # Determine endpoint based on file type
-                file_ext = file_path.lower()
-                if file_ext.endswith(('.wav', '.mp3', '.ogg', '.m4a')):
-                    endpoint = 'sendAudio'
-                    mime_type = 'audio/wav' if file_ext.endswith('.wav') else 'audio/mpeg'
-                    file_key = 'audio'
-                elif file_ext.endswith(('.jpg', '.jpeg', '.png', '.gif')):
-                    endpoint = 'sendPhoto'
-                    mime_type = 'image/jpeg'
-                    file_key = 'photo'
-                else:
-                    endpoint = 'sendDocument'
-                    mime_type = 'application/octet-stream'
-                    file_key = 'document'
-                
-                url = f"https://api.telegram.org/bot{bot_token}/{endpoint}"
-                
-                with open(file_path, 'rb') as f:
-                    files = {file_key: (file_name, f, mime_type)}
-                    data = {'chat_id': chat_id}
-                    
-                    response = requests.post(url, data=data, files=files)
-                    
-                    if not response.ok:
-                        print(f"[ERROR] Failed to send {file_name}: {response.text}")
-                        continue
-                
-                print(f"[SUCCESS] Sent {file_name}")
-        
-        print(f"[SUCCESS] All messages and attachments sent successfully")
+        if failed:
+            print(f"[WARNING] Message sent, but {len(failed)} attachment(s) failed: {', '.join(failed)}")
+        else:
+            print(f"[SUCCESS] All messages and attachments sent successfully")
         return True
         
     except requests.exceptions.RequestException as e:
@@ -525,6 +948,139 @@ def send_telegram_with_attachments(
         return False
 
 
+async def send_telegram_with_audio_async(
+    chat_id: str,
+    message: str,
+    audio_file_path: str,
+    bot_token: str | None = None,
+    source_url: str | None = None,
+    channel_id: str | None = None
+) -> bool:
+    """
+    Awaitable send_telegram_with_audio for callers running an event loop.
+    
+    The send runs in a worker thread (asyncio.to_thread), so the loop keeps
+    serving other tasks while the upload and text parts go out. Same
+    arguments, ordering and return value as send_telegram_with_audio.
+    """
+    return await asyncio.to_thread(
+        send_telegram_with_audio, chat_id, message, audio_file_path, bot_token, source_url, channel_id
+    )
+
+
+async def send_telegram_with_attachments_async(
+    chat_id: str,
+    message: str,
+    attachment_paths: list[str] | None = None,
+    bot_token: str | None = None
+) -> bool:
+    """Awaitable send_telegram_with_attachments (runs in a worker thread, see send_telegram_with_audio_async)."""
+    return await asyncio.to_thread(send_telegram_with_attachments, chat_id, message, attachment_paths, bot_token)
+
+
+async def send_telegram_bulk(
+    chat_ids: list[str],
+    message: str,
+    audio_file_path: str,
+    bot_token: str | None = None
+) -> dict:
+    """
+    Broadcast the same audio file and message to many chats concurrently.
+    
+    Each chat gets the direct-mode sequence of send_telegram_with_audio
+    (audio, then text parts, in order). Chats are served in parallel over one
+    pooled aiohttp session, at most TELEGRAM_BULK_CONCURRENCY at a time, and
+    the audio is read from disk once and reused for every upload. Every call
+    goes through _with_retries_async (rate limits, 429 / 5xx retries).
+    
+    Args:
+        chat_ids: Telegram chat IDs or usernames (@username)
+        message: Text message to send
+        audio_file_path: Path to the audio file (must already be within the 50MB limit)
+        bot_token: Telegram bot token (defaults to env var TELEGRAM_BOT_TOKEN)
+        
+    Returns:
+        Dict mapping each chat_id to True if everything was delivered, False otherwise
+    """
+    import aiohttp
+    
+    bot_token = bot_token or os.getenv('TELEGRAM_BOT_TOKEN')
+    
+    if not bot_token:
+        print("[ERROR] Bot token not provided. Set TELEGRAM_BOT_TOKEN env variable or pass bot_token parameter")
+        return {chat_id: False for chat_id in chat_ids}
+    
+    try:
+        audio_size = os.stat(audio_file_path).st_size
+    except FileNotFoundError:
+        print(f"[ERROR] Audio file not found: {audio_file_path}")
+        return {chat_id: False for chat_id in chat_ids}
+    
+    if audio_size > TELEGRAM_MAX_FILE_SIZE_MB * 1024 * 1024:
+        print(f"[ERROR] Audio file exceeds {TELEGRAM_MAX_FILE_SIZE_MB}MB Telegram limit; compress it first (see send_telegram_with_audio)")
+        return {chat_id: False for chat_id in chat_ids}
+    
+    audio_name = Path(audio_file_path).name
+    audio_mime_type = _guess_mime_type(audio_name)
+    audio_bytes = await asyncio.to_thread(Path(audio_file_path).read_bytes)
+    
+    endpoints = _endpoints(bot_token)
+    text_url = endpoints['sendMessage']
+    audio_url = endpoints['sendAudio']
+    
+    # Same for every chat, so decide once
+    caption, remainder = split_caption(message)
+    message_chunks = split_message(remainder) if remainder else []
+    
+    print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Broadcasting {audio_name} ({audio_size / 1024:.2f} KB) and {len(message)} chars to {len(chat_ids)} chat(s)...")
+    
+    semaphore = asyncio.Semaphore(TELEGRAM_BULK_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=30, ttl_dns_cache=300)
+    
+    async def post(session, url: str, build_data, chat_id: str) -> tuple[int, bytes]:
+        # aiohttp consumes a FormData on send, so each attempt builds its own
+        async def send():
+            async with session.post(url, data=build_data()) as response:
+                return response.status, await response.read(), response.headers
+        return await _with_retries_async(send, chat_id)
+    
+    def audio_form(chat_id: str):
+        form = aiohttp.FormData()
+        form.add_field('chat_id', str(chat_id))
+        if caption:
+            form.add_field('caption', caption)
+        form.add_field('audio', audio_bytes, filename=audio_name, content_type=audio_mime_type)
+        return form
+    
+    async def send_one(session, chat_id: str) -> bool:
+        async with semaphore:
+            try:
+                status, body = await post(session, audio_url, lambda: audio_form(chat_id), chat_id)
+                if status >= 400:
+                    print(f"[ERROR] [{chat_id}] Failed to send audio: {body[:512].decode(errors='replace')}")
+                    return False
+                
+                # Parts must arrive in order within a chat
+                for i, chunk in enumerate(message_chunks, 1):
+                    status, body = await post(session, text_url, lambda: {'chat_id': str(chat_id), 'text': chunk}, chat_id)
+                    if status >= 400:
+                        print(f"[ERROR] [{chat_id}] Failed to send message part {i}: {body[:512].decode(errors='replace')}")
+                        return False
+                
+                return True
+            
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"[ERROR] [{chat_id}] Network error occurred: {e}")
+                return False
+    
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(*(send_one(session, chat_id) for chat_id in chat_ids))
+    
+    sent = dict(zip(chat_ids, results))
+    print(f"[SUCCESS] Broadcast delivered to {sum(results)}/{len(chat_ids)} chat(s)")
+    return sent
+
+
 if __name__ == "__main__":
     # Example usage
     print("=" * 60)
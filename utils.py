@@ -4,6 +4,25 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 
+# [DEBUG] prints are skipped unless LOG_LEVEL=DEBUG, so per-chunk / per-call
+# diagnostics cost nothing (no f-string formatting, no stdout write) in normal runs.
+DEBUG_LOGGING = os.getenv("LOG_LEVEL", "INFO").upper() == "DEBUG"
+
+# Compiled once; IGNORECASE matches the tags in any case without building
+# lowercased copies of responses that can run to 65k chars. One pattern for
+# both tags, so a single scan finds the last opening and last closing tag.
+_FINAL_SCRIPT_TAG_RE = re.compile(r'<(/?)final_script>', re.IGNORECASE)
+
+
+def _last_final_script_tags(text: str) -> tuple[Optional[re.Match], Optional[re.Match]]:
+    """Return the last opening and last closing <final_script> tag matches (or None)."""
+    last_open = last_close = None
+    for match in _FINAL_SCRIPT_TAG_RE.finditer(text):
+        if match.group(1):
+            last_close = match
+        else:
+            last_open = match
+    return last_open, last_close
 
 def remove_thinking_tokens(text: str) -> tuple[str, bool]:
     """
@@ -20,33 +39,44 @@ def remove_thinking_tokens(text: str) -> tuple[str, bool]:
         Tuple of (cleaned_text, success_bool) where success_bool indicates if tags were found
     """
     if not text:
-        print("[DEBUG] remove_thinking_tokens: Empty text received")
+        if DEBUG_LOGGING:
+            print("[DEBUG] remove_thinking_tokens: Empty text received")
         return text, False
 
-    print(f"[DEBUG] remove_thinking_tokens: Processing {len(text)} characters")
+    if DEBUG_LOGGING:
+        print(f"[DEBUG] remove_thinking_tokens: Processing {len(text)} characters")
     original_length = len(text)
 
     # Find the last occurrence of opening and closing tags
-    opening_tag = '<final_script>'
-    closing_tag = '</final_script>'
-    
-    last_open_index = text.lower().rfind(opening_tag.lower())
-    last_close_index = text.lower().rfind(closing_tag.lower())
+    last_open, last_close = _last_final_script_tags(text)
     
-    if last_open_index != -1 and last_close_index != -1 and last_close_index > last_open_index:
+    if last_open and last_close and last_close.start() > last_open.start():
         # Extract content between last opening tag and last closing tag
-        start_pos = last_open_index + len(opening_tag)
-        final_content = text[start_pos:last_close_index].strip()
+        final_content = text[last_open.end():last_close.start()].strip()
         
         print(f"[INFO] [{datetime.now().strftime('%H:%M:%S')}] Found <final_script> tags, extracting content from last occurrence")
         print(f"[CLEANUP] Extracted {len(final_content)} chars from final_script tag (removed {original_length - len(final_content)} chars)")
         return final_content, True
     else:
         print("[WARNING] No valid <final_script> tags found, thinking tokens not properly removed")
-        print(f"[DEBUG] Original text content:\n{text}")
+        if DEBUG_LOGGING:
+            print(f"[DEBUG] Original text content:\n{text}")
         return text.strip(), False
 
 
+# Backup filenames: drop URL protocols, then map every non-word character
+# to '_'. For ASCII URLs (nearly all) a translate table does that in one C
+# pass; anything else keeps the Unicode-aware regex so \w semantics match.
+_URL_PROTOCOL_RE = re.compile(r'https?://')
+_UNSAFE_FILENAME_CHAR_RE = re.compile(r'[^\w\-_]')
+_SAFE_FILENAME_TABLE = {
+    c: '_' for c in range(128) if not (chr(c).isalnum() or chr(c) in '-_')
+}
+
+# Separator line between a backup file's header, content and footer
+_BACKUP_SEPARATOR = '=' * 80
+
+
 def create_backup_file(url: str, content: str, audio_file_path: str, category: str = 'tech') -> str:
     """
     Create a backup file for content and audio when Telegram sending fails.
@@ -66,8 +96,11 @@ def create_backup_file(url: str, content: str, audio_file_path: str, category: s
     
     # Generate a safe filename from the URL
     # Remove protocol and special characters
-    safe_name = re.sub(r'https?://', '', url)
-    safe_name = re.sub(r'[^\w\-_]', '_', safe_name)
+    safe_name = _URL_PROTOCOL_RE.sub('', url)
+    if safe_name.isascii():
+        safe_name = safe_name.translate(_SAFE_FILENAME_TABLE)
+    else:
+        safe_name = _UNSAFE_FILENAME_CHAR_RE.sub('_', safe_name)
     
     # Limit filename length
     if len(safe_name) > 100:
@@ -105,37 +138,46 @@ def parse_backup_file(file_path: str) -> Optional[dict]:
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            lines = f.read().split('\n')
+        
+        # One walk over the lines, no regex: header fields up to the first
+        # separator, the footer after the last one, the content in between.
+        # Layout (see create_backup_file):
+        #   Source URL / Category / Backup Created, ====, content, ====, Audio File Path
+        separators = [i for i, line in enumerate(lines) if line == _BACKUP_SEPARATOR]
+        if len(separators) < 2:
+            print(f"[BACKUP PARSE] Failed to find content in {file_path}")
+            return None
+        header_end, footer_start = separators[0], separators[-1]
+        
+        header = {}
+        for line in lines[:header_end]:
+            key, sep, value = line.partition(':')
+            if sep and key not in header:
+                header[key] = value.strip()
         
         # Extract URL (first line format: "Source URL: <url>")
-        url_match = re.search(r'^Source URL:\s*(.+)$', content, re.MULTILINE)
-        if not url_match:
+        url = header.get('Source URL')
+        if not url:
             print(f"[BACKUP PARSE] Failed to find URL in {file_path}")
             return None
-        url = url_match.group(1).strip()
         
-        # Extract category (optional, defaults to 'tech' for backward compatibility)
-        category_match = re.search(r'^Category:\s*(.+)$', content, re.MULTILINE)
-        category = category_match.group(1).strip() if category_match else 'tech'
-        
-        # Extract timestamp
-        timestamp_match = re.search(r'^Backup Created:\s*(.+)$', content, re.MULTILINE)
-        timestamp = timestamp_match.group(1).strip() if timestamp_match else ""
+        # Category is optional, defaults to 'tech' for backward compatibility
+        category = header.get('Category') or 'tech'
+        timestamp = header.get('Backup Created', "")
         
         # Extract audio file path (last line format: "Audio File Path: <path>")
-        audio_match = re.search(r'^Audio File Path:\s*(.+)$', content, re.MULTILINE)
-        if not audio_match:
+        audio_file_path = None
+        for line in lines[footer_start + 1:]:
+            if line.startswith('Audio File Path:'):
+                audio_file_path = line[len('Audio File Path:'):].strip()
+                break
+        if not audio_file_path:
             print(f"[BACKUP PARSE] Failed to find audio path in {file_path}")
             return None
-        audio_file_path = audio_match.group(1).strip()
         
         # Extract main content (between the separator lines)
-        # Format: ========\n\n<content>\n\n========
-        content_match = re.search(r'={80}\n\n(.*?)\n\n={80}', content, re.DOTALL)
-        if not content_match:
-            print(f"[BACKUP PARSE] Failed to find content in {file_path}")
-            return None
-        main_content = content_match.group(1).strip()
+        main_content = '\n'.join(lines[header_end + 1:footer_start]).strip()
         
         return {
             'url': url,
@@ -161,8 +203,14 @@ def list_backup_files() -> List[Path]:
     if not backup_dir.exists():
         return []
     
-    # Get all .txt files in backup_content/ (not in subdirectories)
-    backup_files = [f for f in backup_dir.glob("*.txt") if f.is_file()]
+    # Get all .txt files in backup_content/ (not in subdirectories).
+    # scandir's DirEntry.is_file() uses the type from the directory read, so
+    # there's no stat per entry; normcase keeps *.TXT matching on Windows.
+    with os.scandir(backup_dir) as entries:
+        backup_files = [
+            Path(entry.path) for entry in entries
+            if os.path.normcase(entry.name).endswith('.txt') and entry.is_file()
+        ]
     print(f"[BACKUP LIST] Found {len(backup_files)} backup files")
     return backup_files
 